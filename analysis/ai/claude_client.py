@@ -2,6 +2,8 @@ import anthropic
 from django.conf import settings
 from datetime import datetime
 import logging
+from market_data.depth_codec import prompt_depth
+from market_data.transport import build_transport
 from .response_parser import ResponseParser
 from .text_cleaner import TextCleaner
 from .structured_formater import StructuredFormatter
@@ -66,7 +68,7 @@ Tajribali treyderlar uchun treyderlar kabi yozing.
 VOLUME_CLUSTER_TEMPLATE = {
     'ru': """
 Проведи объёмный анализ для {symbol} на {timeframe}.
-Данные: цена {current_price}, Volume Profile {volume_profile}, уровни {key_levels}, структура {market_position}.
+Данные: цена {current_price}, Volume Profile {volume_profile}, уровни {key_levels}, структура {market_position}, стакан (ближайшие ценовые корзины) {order_book}.
 
 Создай КРАТКИЙ торговый инсайт в стиле профессионального трейдера, как в примерах:
 "Рынок демонстрирует признаки восстановления после недавнего снижения. Поддержка в области VAL удержалась, и цена стремится вернуться к POC. Если цена закрепится выше $104,700, это может открыть путь к следующему уровню сопротивления около $105,627."
@@ -83,7 +85,7 @@ VOLUME_CLUSTER_TEMPLATE = {
 """,
     'en': """
 Conduct volume analysis for {symbol} on {timeframe}.
-Data: price {current_price}, Volume Profile {volume_profile}, levels {key_levels}, structure {market_position}.
+Data: price {current_price}, Volume Profile {volume_profile}, levels {key_levels}, structure {market_position}, order book (nearest price buckets) {order_book}.
 
 Create BRIEF trading insight in professional trader style, like examples:
 "Market shows signs of recovery after recent decline. Support in VAL area held, and price aims to return to POC. If price consolidates above $104,700, it may open path to next resistance level around $105,627."
@@ -100,7 +102,7 @@ Write as experienced trader for traders.
 """,
     'uz': """
 {symbol} uchun {timeframe} da hajm tahlili o'tkazing.
-Ma'lumotlar: narx {current_price}, Volume Profile {volume_profile}, darajalar {key_levels}, tuzilish {market_position}.
+Ma'lumotlar: narx {current_price}, Volume Profile {volume_profile}, darajalar {key_levels}, tuzilish {market_position}, buyurtmalar kitobi (eng yaqin narx guruhlari) {order_book}.
 
 Professional treyderlar uslubida QISQA savdo insight yarating, masalan:
 "Bozor yaqinda pasayishdan keyin tiklanish belgilarini ko'rsatmoqda. VAL hududidagi qo'llab-quvvatlash saqlanib qoldi va narx POC ga qaytishga intilmoqda. Agar narx $104,700 dan yuqorida mustahkam bo'lsa, bu $105,627 atrofidagi keyingi qarshilik darajasiga yo'l ochishi mumkin."
@@ -177,9 +179,12 @@ class ClaudeClient:
         self.model = settings.CLAUDE_MODEL
         
         try:
+            transport = build_transport("anthropic")
             self.client = anthropic.Anthropic(
                 api_key=self.api_key,
-                timeout=30.0
+                base_url=settings.CLAUDE_BASE_URL,
+                timeout=30.0,
+                http_client=anthropic.DefaultHttpxClient(transport=transport) if transport else None
             )
         except Exception as e:
             logger.error(f"Failed to initialize Claude client: {e}")
@@ -259,6 +264,7 @@ class ClaudeClient:
             symbol=market_data.get('symbol'),
             timeframe=timeframe,
             current_price=market_data.get('current_price'),
+            order_book=prompt_depth(market_data.get('order_book', {})),
             **market_data.get('analysis_data', {})
         )
 
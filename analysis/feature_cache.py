@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from market_data.frame import OhlcvFrame
+from market_data.intervals import interval_to_ms, now_ms
+from market_data.pivots import PivotMasks, detect_pivots
+from market_data.volume_profile import compute_volume_profile
+
+class MarketFeatures:
+    def __init__(self, frame: OhlcvFrame):
+        self.frame = frame
+        self._values: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+
+    def _memo(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = factory()
+            return self._values[key]
+
+    def pivots(self, window: int = 5, strict: bool = False) -> PivotMasks:
+        # detect_pivots already memoizes on the frame, so the masks are cached in exactly one place.
+        return detect_pivots(self.frame, window, strict)
+
+    def swing_levels(self, window: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        def build():
+            masks = self.pivots(window)
+            return self.frame.high[masks.highs], self.frame.low[masks.lows]
+        return self._memo(("swing_levels", window), build)
+
+    def later_extremes(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Lowest low and highest high from each candle to the end; the sentinel covers "nothing later".
+        def build():
+            later_lows = np.append(np.minimum.accumulate(self.frame.low[::-1])[::-1], np.inf)
+            later_highs = np.append(np.maximum.accumulate(self.frame.high[::-1])[::-1], -np.inf)
+            return later_lows, later_highs
+        return self._memo(("later_extremes",), build)
+
+    def window_extremes(self, width: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        def build():
+            highs = sliding_window_view(self.frame.high, width)
+            lows = sliding_window_view(self.frame.low, width)
+            return highs.max(axis=1), highs.min(axis=1), lows.max(axis=1), lows.min(axis=1)
+        return self._memo(("window_extremes", width), build)
+
+    def volume_means(self, width: int) -> np.ndarray:
+        return self._memo(
+            ("volume_means", width),
+            lambda: sliding_window_view(self.frame.volume, width).sum(axis=1) / width
+        )
+
+    def volume_profile(self, bins: int, samples_per_candle: int, mode: str, tick_size: Optional[float]) -> Dict:
+        return self._memo(
+            ("volume_profile", bins, samples_per_candle, mode, tick_size),
+            lambda: compute_volume_profile(self.frame, bins, samples_per_candle, mode=mode, tick_size=tick_size)
+        )
+
+class FeatureCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, MarketFeatures]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(frame: OhlcvFrame) -> Tuple:
+        # Closed candles never change, so the window start, length and forming row pin down the snapshot.
+        return (len(frame), int(frame.timestamp[0]),
+                float(frame.open[-1]), float(frame.high[-1]), float(frame.low[-1]),
+                float(frame.close[-1]), float(frame.volume[-1]))
+
+    def get(self, frame: OhlcvFrame, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> MarketFeatures:
+        if not symbol or not timeframe or not frame:
+            return frame.memo(("features",), lambda: MarketFeatures(frame))
+
+        interval_ms = interval_to_ms(timeframe)
+        closed_count = int(np.searchsorted(frame.timestamp + interval_ms, now_ms(), side="right"))
+        last_closed = int(frame.timestamp[closed_count - 1]) if closed_count else None
+        key = (symbol, timeframe, last_closed)
+        signature = self._signature(frame)
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] != signature:
+                entry = (signature, frame.memo(("features",), lambda: MarketFeatures(frame)))
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+feature_cache = FeatureCache()
@@ -1,12 +1,18 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 import numpy as np
+from market_data.frame import OhlcvFrame
+from market_data.pivots import PivotMasks, pivot_masks
+from analysis.feature_cache import MarketFeatures, feature_cache
 
 class ElliottWaveAnalyzer:
-    def __init__(self):
+    def __init__(self, symbol: Optional[str] = None):
         self.fibonacci_ratios = [0.236, 0.382, 0.5, 0.618, 0.786, 1.0, 1.618, 2.618]
+        self.pivot_window = 5
+        self.symbol = symbol
 
-    def analyze(self, ohlc_data: List[Dict], timeframe: str) -> Dict:
-        wave_structure = self.identify_wave_structure(ohlc_data)
+    def analyze(self, ohlc_data: Union[OhlcvFrame, List[Dict]], timeframe: str) -> Dict:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        wave_structure = self.identify_wave_structure(frame, feature_cache.get(frame, self.symbol, timeframe))
         fibonacci_levels = self.calculate_fibonacci_levels(wave_structure)
         current_wave = self.identify_current_wave(wave_structure)
         forecast = self.generate_forecast(current_wave, fibonacci_levels)
@@ -18,37 +24,36 @@ class ElliottWaveAnalyzer:
             "forecast": forecast
         }
 
-    def identify_wave_structure(self, ohlc_data: List[Dict]) -> Dict:
-        if len(ohlc_data) < 20:
+    def identify_wave_structure(self, ohlc_data: Union[OhlcvFrame, List[Dict]],
+                                features: Optional[MarketFeatures] = None) -> Dict:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        if len(frame) < 20:
             return {}
         
-        highs = [candle['high'] for candle in ohlc_data]
-        lows = [candle['low'] for candle in ohlc_data]
-        closes = [candle['close'] for candle in ohlc_data]
-        
-        pivots = self.find_pivots(highs, lows)
+        masks = (features or feature_cache.get(frame)).pivots(self.pivot_window)
+        pivots = self.find_pivots(frame.high, frame.low, masks)
         waves = self.identify_waves_from_pivots(pivots)
         
         return {
             "waves": waves,
             "pivots": pivots,
-            "trend": self.determine_trend(closes)
+            "trend": self.determine_trend(frame.close)
         }
 
-    def find_pivots(self, highs: List[float], lows: List[float]) -> List[Dict]:
-        pivots = []
-        window = 5
-        
-        for i in range(window, len(highs) - window):
-            is_high_pivot = all(highs[i] >= highs[i+j] for j in range(-window, window+1) if j != 0)
-            is_low_pivot = all(lows[i] <= lows[i+j] for j in range(-window, window+1) if j != 0)
-            
-            if is_high_pivot:
-                pivots.append({"index": i, "price": highs[i], "type": "high"})
-            elif is_low_pivot:
-                pivots.append({"index": i, "price": lows[i], "type": "low"})
-        
-        return pivots
+    def find_pivots(self, highs: Union[np.ndarray, List[float]], lows: Union[np.ndarray, List[float]],
+                    masks: Optional[PivotMasks] = None) -> List[Dict]:
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        masks = masks or pivot_masks(highs, lows, self.pivot_window)
+        
+        indexes = np.flatnonzero(masks.highs | masks.lows)
+        is_high = masks.highs[indexes]
+        prices = np.where(is_high, highs[indexes], lows[indexes])
+        
+        return [
+            {"index": index, "price": price, "type": "high" if high else "low"}
+            for index, price, high in zip(indexes.tolist(), prices.tolist(), is_high.tolist())
+        ]
 
     def identify_waves_from_pivots(self, pivots: List[Dict]) -> Dict:
         if len(pivots) < 5:
@@ -121,7 +126,7 @@ class ElliottWaveAnalyzer:
         
         return forecast
 
-    def determine_trend(self, closes: List[float]) -> str:
+    def determine_trend(self, closes: Union[np.ndarray, List[float]]) -> str:
         if len(closes) < 20:
             return "sideways"
         
@@ -133,4 +138,4 @@ class ElliottWaveAnalyzer:
         elif trend_line[0] < 0:
             return "bearish"
         else:
-            return "sideways"
\ No newline at end of file
+            return "sideways"
@@ -1,12 +1,19 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 import numpy as np
+from market_data.frame import OhlcvFrame
+from analysis.feature_cache import MarketFeatures, feature_cache
 
 class SmartMoneyAnalyzer:
-    def analyze(self, ohlc_data: List[Dict], timeframe: str) -> Dict:
-        order_blocks = self.identify_order_blocks(ohlc_data)
-        fair_value_gaps = self.identify_fair_value_gaps(ohlc_data)
-        structure_breaks = self.analyze_structure_breaks(ohlc_data)
-        liquidity_zones = self.identify_liquidity_zones(ohlc_data)
+    def __init__(self, symbol: Optional[str] = None):
+        self.symbol = symbol
+
+    def analyze(self, ohlc_data: Union[OhlcvFrame, List[Dict]], timeframe: str) -> Dict:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        features = feature_cache.get(frame, self.symbol, timeframe)
+        order_blocks = self.identify_order_blocks(frame, features)
+        fair_value_gaps = self.identify_fair_value_gaps(frame, features)
+        structure_breaks = self.analyze_structure_breaks(frame, features)
+        liquidity_zones = self.identify_liquidity_zones(frame, features)
         smc_signals = self.generate_smc_signals(order_blocks, fair_value_gaps, structure_breaks, liquidity_zones)
         
         return {
@@ -17,195 +24,135 @@ class SmartMoneyAnalyzer:
             "smc_signals": smc_signals
         }
 
-    def identify_order_blocks(self, ohlc_data: List[Dict]) -> List[Dict]:
-        if len(ohlc_data) < 10:
+    def identify_order_blocks(self, ohlc_data: Union[OhlcvFrame, List[Dict]],
+                              features: Optional[MarketFeatures] = None) -> List[Dict]:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        if len(frame) < 10:
             return []
         
-        order_blocks = []
-        
-        for i in range(3, len(ohlc_data) - 3):
-            current = ohlc_data[i]
-            prev_candles = ohlc_data[i-3:i]
-            next_candles = ohlc_data[i+1:i+4]
-            
-            is_bullish_ob = self.is_bullish_order_block(current, prev_candles, next_candles)
-            is_bearish_ob = self.is_bearish_order_block(current, prev_candles, next_candles)
-            
-            if is_bullish_ob:
-                order_blocks.append({
-                    "level": current['low'],
-                    "type": "bullish",
-                    "strength": self.calculate_ob_strength(current, next_candles),
-                    "index": i
-                })
-            elif is_bearish_ob:
-                order_blocks.append({
-                    "level": current['high'],
-                    "type": "bearish", 
-                    "strength": self.calculate_ob_strength(current, next_candles),
-                    "index": i
-                })
-        
-        return order_blocks[-10:]
-
-    def is_bullish_order_block(self, current: Dict, prev_candles: List[Dict], next_candles: List[Dict]) -> bool:
-        if not next_candles:
-            return False
-        
-        current_body = abs(current['close'] - current['open'])
-        current_range = current['high'] - current['low']
-        
-        if current_body < current_range * 0.6:
-            return False
-        
-        if current['close'] <= current['open']:
-            return False
-        
-        next_high = max(candle['high'] for candle in next_candles)
-        return next_high > current['high']
+        features = features or feature_cache.get(frame)
+        size = len(frame)
+        opens, highs, lows, closes, volumes = (
+            column[3:size - 3] for column in (frame.open, frame.high, frame.low, frame.close, frame.volume)
+        )
+        next_high_max, _, _, next_low_min = (extreme[4:size - 2] for extreme in features.window_extremes(3))
+        
+        impulsive = ~(np.abs(closes - opens) < (highs - lows) * 0.6)
+        bullish = impulsive & (closes > opens) & (next_high_max > highs)
+        bearish = impulsive & (closes < opens) & (next_low_min < lows)
+        
+        positions = np.flatnonzero(bullish | bearish)[-10:]
+        next_volume_mean = features.volume_means(3)[positions + 4]
+        strengths = self.calculate_ob_strength(volumes[positions], next_volume_mean)
+        is_bullish = bullish[positions]
+        levels = np.where(is_bullish, lows[positions], highs[positions])
+        
+        return [
+            {
+                "level": level,
+                "type": "bullish" if bull else "bearish",
+                "strength": strength,
+                "index": index
+            }
+            for level, bull, strength, index in zip(
+                levels.tolist(), is_bullish.tolist(), strengths.tolist(), (positions + 3).tolist()
+            )
+        ]
 
-    def is_bearish_order_block(self, current: Dict, prev_candles: List[Dict], next_candles: List[Dict]) -> bool:
-        if not next_candles:
-            return False
-        
-        current_body = abs(current['close'] - current['open'])
-        current_range = current['high'] - current['low']
-        
-        if current_body < current_range * 0.6:
-            return False
-        
-        if current['close'] >= current['open']:
-            return False
-        
-        next_low = min(candle['low'] for candle in next_candles)
-        return next_low < current['low']
+    def calculate_ob_strength(self, volumes: np.ndarray, next_volume_mean: np.ndarray) -> np.ndarray:
+        return np.select(
+            [volumes > next_volume_mean * 1.5, volumes > next_volume_mean],
+            ["strong", "medium"],
+            default="weak"
+        )
 
-    def calculate_ob_strength(self, current: Dict, next_candles: List[Dict]) -> str:
-        if not next_candles:
-            return "weak"
-        
-        current_volume = current.get('volume', 0)
-        avg_volume = sum(candle.get('volume', 0) for candle in next_candles) / len(next_candles)
-        
-        if current_volume > avg_volume * 1.5:
-            return "strong"
-        elif current_volume > avg_volume:
-            return "medium"
-        else:
-            return "weak"
-
-    def identify_fair_value_gaps(self, ohlc_data: List[Dict]) -> List[Dict]:
-        if len(ohlc_data) < 3:
+    def identify_fair_value_gaps(self, ohlc_data: Union[OhlcvFrame, List[Dict]],
+                                 features: Optional[MarketFeatures] = None) -> List[Dict]:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        if len(frame) < 3:
             return []
         
-        fvgs = []
-        
-        for i in range(1, len(ohlc_data) - 1):
-            prev_candle = ohlc_data[i-1]
-            current_candle = ohlc_data[i]
-            next_candle = ohlc_data[i+1]
-            
-            bullish_fvg = self.is_bullish_fvg(prev_candle, current_candle, next_candle)
-            bearish_fvg = self.is_bearish_fvg(prev_candle, current_candle, next_candle)
-            
-            if bullish_fvg:
-                fvgs.append({
-                    "start": prev_candle['high'],
-                    "end": next_candle['low'],
-                    "type": "bullish",
-                    "status": "unfilled",
-                    "index": i
-                })
-            elif bearish_fvg:
-                fvgs.append({
-                    "start": prev_candle['low'],
-                    "end": next_candle['high'],
-                    "type": "bearish",
-                    "status": "unfilled",
-                    "index": i
-                })
-        
-        return fvgs[-10:]
-
-    def is_bullish_fvg(self, prev: Dict, current: Dict, next: Dict) -> bool:
-        return prev['high'] < next['low'] and current['close'] > current['open']
+        prev_highs, next_lows = frame.high[:-2], frame.low[2:]
+        prev_lows, next_highs = frame.low[:-2], frame.high[2:]
+        opens, closes = frame.open[1:-1], frame.close[1:-1]
+        
+        bullish = (prev_highs < next_lows) & (closes > opens)
+        bearish = (prev_lows > next_highs) & (closes < opens)
+        
+        positions = np.flatnonzero(bullish | bearish)[-10:]
+        is_bullish = bullish[positions]
+        starts = np.where(is_bullish, prev_highs[positions], prev_lows[positions])
+        ends = np.where(is_bullish, next_lows[positions], next_highs[positions])
+        
+        later_lows, later_highs = (features or feature_cache.get(frame)).later_extremes()
+        reached = np.where(is_bullish, later_lows[positions + 3], later_highs[positions + 3])
+        
+        fill_ratios = np.clip((ends - reached) / (ends - starts), 0.0, 1.0)
+        statuses = np.select([fill_ratios >= 1.0, fill_ratios > 0.0], ["filled", "partially_filled"], default="unfilled")
+        
+        return [
+            {
+                "start": start,
+                "end": end,
+                "type": "bullish" if bull else "bearish",
+                "status": gap_status,
+                "fill_ratio": fill_ratio,
+                "index": index
+            }
+            for start, end, bull, gap_status, fill_ratio, index in zip(
+                starts.tolist(), ends.tolist(), is_bullish.tolist(), statuses.tolist(),
+                fill_ratios.tolist(), (positions + 1).tolist()
+            )
+        ]
 
-    def is_bearish_fvg(self, prev: Dict, current: Dict, next: Dict) -> bool:
-        return prev['low'] > next['high'] and current['close'] < current['open']
-
-    def analyze_structure_breaks(self, ohlc_data: List[Dict]) -> List[Dict]:
-        if len(ohlc_data) < 20:
+    def analyze_structure_breaks(self, ohlc_data: Union[OhlcvFrame, List[Dict]],
+                                 features: Optional[MarketFeatures] = None) -> List[Dict]:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        if len(frame) < 20:
             return []
         
-        structure_breaks = []
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(5, len(ohlc_data) - 5):
-            is_swing_high = all(ohlc_data[i]['high'] >= ohlc_data[j]['high'] for j in range(i-5, i+6) if j != i)
-            is_swing_low = all(ohlc_data[i]['low'] <= ohlc_data[j]['low'] for j in range(i-5, i+6) if j != i)
-            
-            if is_swing_high:
-                swing_highs.append({"price": ohlc_data[i]['high'], "index": i})
-            if is_swing_low:
-                swing_lows.append({"price": ohlc_data[i]['low'], "index": i})
-        
-        for i in range(len(swing_highs) - 1):
-            current_high = swing_highs[i]
-            next_high = swing_highs[i + 1]
-            
-            if next_high["price"] > current_high["price"]:
-                structure_breaks.append({
-                    "level": current_high["price"],
-                    "direction": "bullish",
-                    "confirmed": True,
-                    "type": "higher_high"
-                })
-        
-        for i in range(len(swing_lows) - 1):
-            current_low = swing_lows[i]
-            next_low = swing_lows[i + 1]
-            
-            if next_low["price"] < current_low["price"]:
-                structure_breaks.append({
-                    "level": current_low["price"],
-                    "direction": "bearish",
-                    "confirmed": True,
-                    "type": "lower_low"
-                })
+        swing_highs, swing_lows = (features or feature_cache.get(frame)).swing_levels(5)
+        
+        higher_highs = swing_highs[:-1][swing_highs[1:] > swing_highs[:-1]]
+        lower_lows = swing_lows[:-1][swing_lows[1:] < swing_lows[:-1]]
+        
+        structure_breaks = [
+            {"level": level, "direction": "bullish", "confirmed": True, "type": "higher_high"}
+            for level in higher_highs.tolist()
+        ] + [
+            {"level": level, "direction": "bearish", "confirmed": True, "type": "lower_low"}
+            for level in lower_lows.tolist()
+        ]
         
         return structure_breaks[-5:]
 
-    def identify_liquidity_zones(self, ohlc_data: List[Dict]) -> List[Dict]:
-        if len(ohlc_data) < 10:
+    def identify_liquidity_zones(self, ohlc_data: Union[OhlcvFrame, List[Dict]],
+                                 features: Optional[MarketFeatures] = None) -> List[Dict]:
+        frame = OhlcvFrame.coerce(ohlc_data)
+        if len(frame) < 10:
             return []
         
-        liquidity_zones = []
-        
-        for i in range(5, len(ohlc_data) - 1):
-            current = ohlc_data[i]
-            prev_candles = ohlc_data[i-5:i]
-            
-            prev_highs = [candle['high'] for candle in prev_candles]
-            prev_lows = [candle['low'] for candle in prev_candles]
-            
-            if current['high'] > max(prev_highs):
-                liquidity_zones.append({
-                    "start": min(prev_highs),
-                    "end": max(prev_highs),
-                    "type": "swept",
-                    "direction": "bullish"
-                })
-            
-            if current['low'] < min(prev_lows):
-                liquidity_zones.append({
-                    "start": min(prev_lows),
-                    "end": max(prev_lows),
-                    "type": "swept",
-                    "direction": "bearish"
-                })
-        
-        return liquidity_zones[-5:]
+        size = len(frame)
+        highs, lows = frame.high[5:size - 1], frame.low[5:size - 1]
+        prev_high_max, prev_high_min, prev_low_max, prev_low_min = (
+            extreme[:size - 6] for extreme in (features or feature_cache.get(frame)).window_extremes(5)
+        )
+        
+        sweeps = np.stack((highs > prev_high_max, lows < prev_low_min), axis=1).ravel()
+        events = np.flatnonzero(sweeps)[-5:]
+        positions, is_bearish = events // 2, events % 2 == 1
+        starts = np.where(is_bearish, prev_low_min[positions], prev_high_min[positions])
+        ends = np.where(is_bearish, prev_low_max[positions], prev_high_max[positions])
+        
+        return [
+            {
+                "start": start,
+                "end": end,
+                "type": "swept",
+                "direction": "bearish" if bear else "bullish"
+            }
+            for start, end, bear in zip(starts.tolist(), ends.tolist(), is_bearish.tolist())
+        ]
 
     def generate_smc_signals(self, order_blocks: List[Dict], fair_value_gaps: List[Dict], 
                            structure_breaks: List[Dict], liquidity_zones: List[Dict]) -> Dict:
@@ -225,8 +172,8 @@ class SmartMoneyAnalyzer:
             elif sb['direction'] == 'bearish' and sb['confirmed']:
                 bearish_signals += 1
         
-        unfilled_bullish_fvgs = [fvg for fvg in fair_value_gaps if fvg['type'] == 'bullish' and fvg['status'] == 'unfilled']
-        unfilled_bearish_fvgs = [fvg for fvg in fair_value_gaps if fvg['type'] == 'bearish' and fvg['status'] == 'unfilled']
+        unfilled_bullish_fvgs = [fvg for fvg in fair_value_gaps if fvg['type'] == 'bullish' and fvg['status'] != 'filled']
+        unfilled_bearish_fvgs = [fvg for fvg in fair_value_gaps if fvg['type'] == 'bearish' and fvg['status'] != 'filled']
         
         if len(unfilled_bullish_fvgs) > len(unfilled_bearish_fvgs):
             bullish_signals += 1
@@ -249,4 +196,4 @@ class SmartMoneyAnalyzer:
             "bullish_signals": bullish_signals,
             "bearish_signals": bearish_signals,
             "unfilled_fvgs": len(unfilled_bullish_fvgs) + len(unfilled_bearish_fvgs)
-        }
\ No newline at end of file
+        }
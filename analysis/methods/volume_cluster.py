@@ -1,85 +1,91 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 import numpy as np
+from market_data.frame import OhlcvFrame
+from market_data.volume_profile import (
+    tick_precision, DEFAULT_BINS, DEFAULT_SAMPLES_PER_CANDLE, MODE_SAMPLED, MODE_OVERLAP
+)
+from market_data.incremental_profile import rolling_volume_profiles
+from market_data.composite_profile import composite_profiles, CompositeVolumeProfile, COMPOSITE_PERIODS
+from market_data.order_book_analytics import analyze_depth
+from analysis.feature_cache import feature_cache
 
 class VolumeClusterAnalyzer:
-    def analyze(self, ohlcv_data: List[Dict], order_book_data: Dict, timeframe: str) -> Dict:
-        volume_profile = self.calculate_volume_profile(ohlcv_data)
-        key_levels = self.identify_key_levels(volume_profile, order_book_data)
+    def __init__(self, bins: int = DEFAULT_BINS, samples_per_candle: int = DEFAULT_SAMPLES_PER_CANDLE,
+                 mode: str = MODE_SAMPLED, tick_size: Optional[float] = None, symbol: Optional[str] = None):
+        self.bins = bins
+        self.samples_per_candle = samples_per_candle
+        self.mode = mode
+        self.tick_size = tick_size
+        self.symbol = symbol
+        self.price_precision = tick_precision(tick_size) + 1 if tick_size else 2
+
+    def analyze(self, ohlcv_data: Union[OhlcvFrame, List[Dict]], order_book_data: Dict, timeframe: str) -> Dict:
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        volume_profile = self.calculate_volume_profile(frame, timeframe)
+        composites = self.calculate_composite_profiles(frame, timeframe)
+        order_book_liquidity = analyze_depth(order_book_data, tick_size=self.tick_size) if order_book_data else {}
+        key_levels = self.identify_key_levels(volume_profile, order_book_data, order_book_liquidity)
         market_position = self.analyze_market_position(key_levels)
         trading_signals = self.generate_trading_signals(market_position)
         
         return {
             "volume_profile": volume_profile,
+            "composite_profiles": composites,
             "key_levels": key_levels,
+            "order_book_liquidity": order_book_liquidity,
             "market_position": market_position,
             "trading_signals": trading_signals
         }
 
-    def calculate_volume_profile(self, ohlcv_data: List[Dict]) -> Dict:
-        if not ohlcv_data:
-            return {}
+    def calculate_volume_profile(self, ohlcv_data: Union[OhlcvFrame, List[Dict]], timeframe: Optional[str] = None) -> Dict:
+        if self.mode == MODE_OVERLAP and self.symbol and timeframe:
+            profile = rolling_volume_profiles.get_profile(
+                self.symbol, timeframe, ohlcv_data, tick_size=self.tick_size, bins=self.bins
+            )
+        else:
+            profile = feature_cache.get(OhlcvFrame.coerce(ohlcv_data), self.symbol, timeframe).volume_profile(
+                self.bins, self.samples_per_candle, self.mode, self.tick_size
+            )
         
-        all_prices = []
-        all_volumes = []
+        if not profile:
+            return {}
         
-        for candle in ohlcv_data:
-            high = candle['high']
-            low = candle['low']
-            volume = candle['volume']
-            
-            price_levels = np.linspace(low, high, 10)
-            volume_per_level = volume / 10
-            
-            all_prices.extend(price_levels)
-            all_volumes.extend([volume_per_level] * 10)
+        price_levels = np.round(profile["price_levels"], self.price_precision).tolist()
         
-        if not all_prices:
+        return {
+            "poc": round(profile["poc"], self.price_precision),
+            "vah": round(profile["vah"], self.price_precision),
+            "val": round(profile["val"], self.price_precision),
+            "volume_distribution": dict(zip(price_levels, profile["volumes"].tolist()))
+        }
+
+    def calculate_composite_profiles(self, ohlcv_data: Union[OhlcvFrame, List[Dict]], timeframe: Optional[str] = None) -> Dict:
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        if not frame:
             return {}
         
-        min_price = min(all_prices)
-        max_price = max(all_prices)
-        price_bins = np.linspace(min_price, max_price, 50)
+        composites = {}
         
-        volume_by_price = {}
-        
-        for i in range(len(price_bins) - 1):
-            bin_volume = 0
-            bin_center = (price_bins[i] + price_bins[i + 1]) / 2
-            
-            for j, price in enumerate(all_prices):
-                if price_bins[i] <= price < price_bins[i + 1]:
-                    bin_volume += all_volumes[j]
+        for period in COMPOSITE_PERIODS:
+            if self.symbol and timeframe:
+                profile = composite_profiles.query(
+                    self.symbol, timeframe, frame, period, last_periods=1, tick_size=self.tick_size, bins=self.bins
+                )
+            else:
+                profile = CompositeVolumeProfile.from_frame(frame, period, self.tick_size, self.bins).last()
             
-            volume_by_price[round(bin_center, 2)] = bin_volume
-        
-        sorted_volumes = sorted(volume_by_price.items(), key=lambda x: x[1], reverse=True)
-        
-        poc = sorted_volumes[0][0] if sorted_volumes else 0
-        
-        total_volume = sum(volume_by_price.values())
-        value_area_volume = total_volume * 0.68
-        cumulative_volume = 0
-        
-        vah = poc
-        val = poc
-        
-        for price, volume in sorted_volumes:
-            cumulative_volume += volume
-            if price > poc:
-                vah = max(vah, price)
-            if price < poc:
-                val = min(val, price)
-            if cumulative_volume >= value_area_volume:
-                break
-        
-        return {
-            "poc": poc,
-            "vah": vah,
-            "val": val,
-            "volume_distribution": volume_by_price
-        }
+            if profile:
+                composites[period] = {
+                    "poc": round(profile["poc"], self.price_precision),
+                    "vah": round(profile["vah"], self.price_precision),
+                    "val": round(profile["val"], self.price_precision),
+                    "start": profile["start"]
+                }
+        
+        return composites
 
-    def identify_key_levels(self, volume_profile: Dict, order_book_data: Dict) -> Dict:
+    def identify_key_levels(self, volume_profile: Dict, order_book_data: Dict,
+                            order_book_liquidity: Optional[Dict] = None) -> Dict:
         key_levels = {
             "support_levels": [],
             "resistance_levels": [],
@@ -105,29 +111,18 @@ class VolumeClusterAnalyzer:
         key_levels["resistance_levels"] = sorted(resistance_levels)[:5]
         
         if order_book_data:
-            bid_levels = self.analyze_order_book_levels(order_book_data, "bids")
-            ask_levels = self.analyze_order_book_levels(order_book_data, "asks")
+            liquidity = order_book_liquidity if order_book_liquidity is not None else analyze_depth(order_book_data, tick_size=self.tick_size)
+            bid_levels = self.analyze_order_book_levels(liquidity, "bids")
+            ask_levels = self.analyze_order_book_levels(liquidity, "asks")
             
             key_levels["bid_support"] = bid_levels
             key_levels["ask_resistance"] = ask_levels
         
         return key_levels
 
-    def analyze_order_book_levels(self, order_book_data: Dict, side: str) -> List[float]:
-        if side not in order_book_data:
-            return []
-        
-        levels = order_book_data[side][:20]
-        significant_levels = []
-        
-        for price_str, quantity_str in levels:
-            price = float(price_str)
-            quantity = float(quantity_str)
-            
-            if quantity > 100:
-                significant_levels.append(price)
-        
-        return significant_levels[:5]
+    def analyze_order_book_levels(self, order_book_liquidity: Dict, side: str) -> List[float]:
+        walls = order_book_liquidity.get("bid_walls" if side == "bids" else "ask_walls", [])
+        return [wall["price"] for wall in walls[:5]]
 
     def analyze_market_position(self, key_levels: Dict) -> Dict:
         support_levels = key_levels.get("support_levels", [])
@@ -0,0 +1,179 @@
+import random
+import numpy as np
+from django.test import SimpleTestCase
+from analysis.feature_cache import feature_cache
+from analysis.methods.elliott_wave import ElliottWaveAnalyzer
+from analysis.methods.smart_money import SmartMoneyAnalyzer
+from market_data.data_processor import calculate_support_resistance
+from market_data.frame import OhlcvFrame
+from market_data.pivots import detect_pivots
+
+LENGTHS = (3, 9, 10, 11, 15, 19, 20, 21, 40, 100, 300)
+
+def random_candles(seed: int, length: int, discrete: bool = False):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    if discrete:
+        close = np.round(close)
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    if discrete:
+        high = np.maximum(open_, close) + rng.integers(0, 2, length)
+        low = np.minimum(open_, close) - rng.integers(0, 2, length)
+        volume = rng.integers(0, 5, length).astype(float)
+    else:
+        high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.5, length))
+        low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.5, length))
+        volume = rng.gamma(2, 10, length)
+    return [
+        {"timestamp": 1_700_000_000_000 + index * 3_600_000, "open": float(open_[index]), "high": float(high[index]),
+         "low": float(low[index]), "close": float(close[index]), "volume": float(volume[index])}
+        for index in range(length)
+    ]
+
+def legacy_order_blocks(candles):
+    if len(candles) < 10:
+        return []
+
+    order_blocks = []
+    for i in range(3, len(candles) - 3):
+        current, next_candles = candles[i], candles[i + 1:i + 4]
+        if abs(current['close'] - current['open']) < (current['high'] - current['low']) * 0.6:
+            continue
+        if current['close'] > current['open'] and max(c['high'] for c in next_candles) > current['high']:
+            level, kind = current['low'], "bullish"
+        elif current['close'] < current['open'] and min(c['low'] for c in next_candles) < current['low']:
+            level, kind = current['high'], "bearish"
+        else:
+            continue
+
+        average = sum(c['volume'] for c in next_candles) / len(next_candles)
+        if current['volume'] > average * 1.5:
+            strength = "strong"
+        elif current['volume'] > average:
+            strength = "medium"
+        else:
+            strength = "weak"
+        order_blocks.append({"level": level, "type": kind, "strength": strength, "index": i})
+    return order_blocks[-10:]
+
+def legacy_fair_value_gaps(candles):
+    gaps = []
+    for i in range(1, len(candles) - 1):
+        prev, current, next_candle = candles[i - 1], candles[i], candles[i + 1]
+        if prev['high'] < next_candle['low'] and current['close'] > current['open']:
+            gaps.append({"start": prev['high'], "end": next_candle['low'], "type": "bullish", "index": i})
+        elif prev['low'] > next_candle['high'] and current['close'] < current['open']:
+            gaps.append({"start": prev['low'], "end": next_candle['high'], "type": "bearish", "index": i})
+    return gaps[-10:]
+
+def legacy_structure_breaks(candles):
+    if len(candles) < 20:
+        return []
+
+    swing_highs, swing_lows = [], []
+    for i in range(5, len(candles) - 5):
+        if all(candles[i]['high'] >= candles[j]['high'] for j in range(i - 5, i + 6) if j != i):
+            swing_highs.append(candles[i]['high'])
+        if all(candles[i]['low'] <= candles[j]['low'] for j in range(i - 5, i + 6) if j != i):
+            swing_lows.append(candles[i]['low'])
+
+    structure_breaks = [
+        {"level": current, "direction": "bullish", "confirmed": True, "type": "higher_high"}
+        for current, following in zip(swing_highs, swing_highs[1:]) if following > current
+    ] + [
+        {"level": current, "direction": "bearish", "confirmed": True, "type": "lower_low"}
+        for current, following in zip(swing_lows, swing_lows[1:]) if following < current
+    ]
+    return structure_breaks[-5:]
+
+def legacy_liquidity_zones(candles):
+    if len(candles) < 10:
+        return []
+
+    zones = []
+    for i in range(5, len(candles) - 1):
+        prev_highs = [c['high'] for c in candles[i - 5:i]]
+        prev_lows = [c['low'] for c in candles[i - 5:i]]
+        if candles[i]['high'] > max(prev_highs):
+            zones.append({"start": min(prev_highs), "end": max(prev_highs), "type": "swept", "direction": "bullish"})
+        if candles[i]['low'] < min(prev_lows):
+            zones.append({"start": min(prev_lows), "end": max(prev_lows), "type": "swept", "direction": "bearish"})
+    return zones[-5:]
+
+def legacy_wave_pivots(candles):
+    pivots = []
+    for i in range(5, len(candles) - 5):
+        neighbours = [candles[i + j] for j in range(-5, 6) if j != 0]
+        if all(candles[i]['high'] >= c['high'] for c in neighbours):
+            pivots.append({"index": i, "price": candles[i]['high'], "type": "high"})
+        elif all(candles[i]['low'] <= c['low'] for c in neighbours):
+            pivots.append({"index": i, "price": candles[i]['low'], "type": "low"})
+    return pivots
+
+def legacy_support_resistance(candles):
+    if len(candles) < 20:
+        return {"support_levels": [], "resistance_levels": []}
+
+    lows = [c['low'] for c in candles]
+    highs = [c['high'] for c in candles]
+    support = [lows[i] for i in range(2, len(lows) - 2) if all(lows[i] < lows[i + j] for j in (-2, -1, 1, 2))]
+    resistance = [highs[i] for i in range(2, len(highs) - 2) if all(highs[i] > highs[i + j] for j in (-2, -1, 1, 2))]
+    return {
+        "support_levels": sorted(set(support), reverse=True)[:5],
+        "resistance_levels": sorted(set(resistance))[:5]
+    }
+
+class LegacyParityTests(SimpleTestCase):
+    def cases(self):
+        for seed in range(60):
+            for discrete in (False, True):
+                length = random.Random(seed).choice(LENGTHS)
+                yield f"seed={seed} discrete={discrete} length={length}", random_candles(seed, length, discrete)
+
+    def test_smart_money_matches_legacy_loops(self):
+        for case, candles in self.cases():
+            with self.subTest(case):
+                result = SmartMoneyAnalyzer().analyze(candles, "1h")
+                gaps = [{key: gap[key] for key in ("start", "end", "type", "index")} for gap in result["fair_value_gaps"]]
+
+                self.assertEqual(result["order_blocks"], legacy_order_blocks(candles))
+                self.assertEqual(gaps, legacy_fair_value_gaps(candles))
+                self.assertEqual(result["structure_breaks"], legacy_structure_breaks(candles))
+                self.assertEqual(result["liquidity_zones"], legacy_liquidity_zones(candles))
+
+    def test_fair_value_gap_fill_ratio(self):
+        for case, candles in self.cases():
+            with self.subTest(case):
+                for gap in SmartMoneyAnalyzer().identify_fair_value_gaps(candles):
+                    later = candles[gap["index"] + 2:]
+                    if gap["type"] == "bullish":
+                        reached = min((c['low'] for c in later), default=float("inf"))
+                    else:
+                        reached = max((c['high'] for c in later), default=float("-inf"))
+                    fill_ratio = min(max((gap["end"] - reached) / (gap["end"] - gap["start"]), 0.0), 1.0)
+
+                    self.assertAlmostEqual(gap["fill_ratio"], fill_ratio)
+                    expected_status = "filled" if fill_ratio >= 1.0 else "partially_filled" if fill_ratio > 0.0 else "unfilled"
+                    self.assertEqual(gap["status"], expected_status)
+
+    def test_elliott_wave_pivots_match_legacy_loop(self):
+        for case, candles in self.cases():
+            with self.subTest(case):
+                structure = ElliottWaveAnalyzer().identify_wave_structure(candles)
+                self.assertEqual(structure.get("pivots", []), legacy_wave_pivots(candles) if len(candles) >= 20 else [])
+
+    def test_support_resistance_matches_legacy_loop(self):
+        for case, candles in self.cases():
+            with self.subTest(case):
+                self.assertEqual(calculate_support_resistance(candles), legacy_support_resistance(candles))
+
+class FeatureCacheTests(SimpleTestCase):
+    def test_pivots_are_memoized_once_on_the_frame(self):
+        frame = OhlcvFrame.from_candles(random_candles(1, 100))
+        features = feature_cache.get(frame)
+
+        self.assertIs(features.pivots(5), detect_pivots(frame, 5))
+        ElliottWaveAnalyzer().identify_wave_structure(frame, features)
+        SmartMoneyAnalyzer().analyze_structure_breaks(frame, features)
+        self.assertEqual(sorted(key for key in frame._cache if key[0] == "pivots"), [("pivots", 5, False)])
@@ -1,31 +1,58 @@
 import logging
+import math
+from market_data.exceptions import (
+    BinanceAPIError, BinanceClientError, BinanceRateLimitError, BinanceTimeoutError, CircuitOpenError
+)
 
 logger = logging.getLogger('trading_analysis')
 
+ERROR_HTTP_STATUS = {
+    "RATE_LIMIT": 429,
+    "CIRCUIT_OPEN": 503,
+    "TIMEOUT": 504,
+    "INVALID_REQUEST": 400,
+    "NOT_FOUND": 404,
+    "API_ERROR": 502
+}
+
 class ErrorHandler:
     @staticmethod
     def handle_binance_error(error):
         error_msg = str(error)
+        status_code = error.status_code if isinstance(error, BinanceAPIError) else None
         
-        if "429" in error_msg or "rate limit" in error_msg.lower():
+        if isinstance(error, BinanceRateLimitError):
             logger.error("Binance rate limit exceeded")
             return {
                 "error": "Rate limit exceeded",
-                "retry_after": 60,
+                "retry_after": math.ceil(error.retry_after or 60),
                 "error_code": "RATE_LIMIT"
             }
-        elif "400" in error_msg or "invalid" in error_msg.lower():
-            logger.error(f"Invalid Binance request: {error_msg}")
+        elif isinstance(error, CircuitOpenError):
+            logger.error(f"Binance circuit open: {error_msg}")
             return {
-                "error": "Invalid symbol or parameters",
-                "error_code": "INVALID_REQUEST"
+                "error": "Binance API temporarily unavailable",
+                "retry_after": math.ceil(error.retry_after or 1),
+                "error_code": "CIRCUIT_OPEN"
+            }
+        elif isinstance(error, BinanceTimeoutError):
+            logger.error(f"Binance API timeout: {error_msg}")
+            return {
+                "error": "Binance API timeout",
+                "error_code": "TIMEOUT"
             }
-        elif "404" in error_msg:
+        elif isinstance(error, BinanceClientError) and status_code == 404:
             logger.error(f"Binance endpoint not found: {error_msg}")
             return {
                 "error": "Symbol not found",
                 "error_code": "NOT_FOUND"
             }
+        elif isinstance(error, BinanceClientError):
+            logger.error(f"Invalid Binance request: {error_msg}")
+            return {
+                "error": "Invalid symbol or parameters",
+                "error_code": "INVALID_REQUEST"
+            }
         else:
             logger.error(f"Binance API error: {error_msg}")
             return {
@@ -0,0 +1,30 @@
+from http.server import ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+from market_data.standin_server import DepthStandInServer, SyntheticDepthFeed, standin_handler
+
+class Command(BaseCommand):
+    help = 'Serve synthetic Binance and Messages API responses for offline runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--ws-port', type=int, default=8766)
+
+    def handle(self, *args, **options):
+        feed = SyntheticDepthFeed()
+        depth_server = DepthStandInServer(feed)
+        ws_url = depth_server.start(options['host'], options['ws_port'])
+        server = ThreadingHTTPServer((options['host'], options['port']), standin_handler(feed))
+        server.daemon_threads = True
+        url = f"http://{options['host']}:{server.server_address[1]}"
+        self.stdout.write(self.style.SUCCESS(
+            f'Stand-in server on {url} (set BINANCE_BASE_URL/BINANCE_BASE_URLS and CLAUDE_BASE_URL to it)'
+        ))
+        self.stdout.write(self.style.SUCCESS(f'Depth stream stand-in on {ws_url} (set BINANCE_WS_URL to it)'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            depth_server.stop()
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from api.symbol_catalogue import symbol_catalogue
+
+class Command(BaseCommand):
+    help = 'Sync the Binance symbol catalogue into the Symbol table'
+
+    def handle(self, *args, **options):
+        count = symbol_catalogue.sync()
+        self.stdout.write(self.style.SUCCESS(f'Synced {count} symbols'))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='symbol',
+            name='status',
+            field=models.CharField(default='TRADING', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='symbol',
+            name='step_size',
+            field=models.DecimalField(blank=True, decimal_places=10, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='symbol',
+            name='tick_size',
+            field=models.DecimalField(blank=True, decimal_places=10, max_digits=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='symbol',
+            name='base_asset',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='symbol',
+            name='quote_asset',
+            field=models.CharField(max_length=20),
+        ),
+    ]
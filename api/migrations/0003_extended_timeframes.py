@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_symbol_catalogue_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysisrequest',
+            name='timeframe',
+            field=models.CharField(choices=[('1h', '1 Hour'), ('2h', '2 Hours'), ('4h', '4 Hours'), ('6h', '6 Hours'), ('12h', '12 Hours'), ('1d', '1 Day'), ('1w', '1 Week')], max_length=5),
+        ),
+    ]
@@ -11,8 +11,12 @@ class AnalysisRequest(models.Model):
     
     TIMEFRAMES = [
         ('1h', '1 Hour'),
+        ('2h', '2 Hours'),
         ('4h', '4 Hours'),
+        ('6h', '6 Hours'),
+        ('12h', '12 Hours'),
         ('1d', '1 Day'),
+        ('1w', '1 Week'),
     ]
     
     STATUS_CHOICES = [
@@ -49,8 +53,11 @@ class AnalysisResult(models.Model):
 
 class Symbol(models.Model):
     symbol = models.CharField(max_length=20, unique=True)
-    base_asset = models.CharField(max_length=10)
-    quote_asset = models.CharField(max_length=10)
+    base_asset = models.CharField(max_length=20)
+    quote_asset = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, default='TRADING')
+    tick_size = models.DecimalField(max_digits=20, decimal_places=10, null=True, blank=True)
+    step_size = models.DecimalField(max_digits=20, decimal_places=10, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     last_updated = models.DateTimeField(auto_now=True)
     
@@ -35,7 +35,8 @@ class AnalysisResultSerializer(serializers.ModelSerializer):
 class SymbolSerializer(serializers.ModelSerializer):
     class Meta:
         model = Symbol
-        fields = ['id', 'symbol', 'base_asset', 'quote_asset', 'is_active', 'last_updated']
+        fields = ['id', 'symbol', 'base_asset', 'quote_asset', 'status', 'tick_size', 'step_size',
+                 'is_active', 'last_updated']
         read_only_fields = ['id', 'last_updated']
 
 class MarketDataSerializer(serializers.ModelSerializer):
@@ -0,0 +1,178 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from market_data.client import BinanceClient
+from .models import Symbol
+
+logger = logging.getLogger('trading_analysis')
+
+class SymbolEntry(NamedTuple):
+    symbol: str
+    base_asset: str
+    quote_asset: str
+    status: str
+    tick_size: Optional[float]
+    step_size: Optional[float]
+
+def parse_exchange_info(exchange_info: Dict) -> List[SymbolEntry]:
+    entries = []
+    for symbol_info in exchange_info.get('symbols', []):
+        filters = {f['filterType']: f for f in symbol_info.get('filters', [])}
+        tick_size = filters.get('PRICE_FILTER', {}).get('tickSize')
+        step_size = filters.get('LOT_SIZE', {}).get('stepSize')
+        entries.append(SymbolEntry(
+            symbol=symbol_info['symbol'],
+            base_asset=symbol_info['baseAsset'],
+            quote_asset=symbol_info['quoteAsset'],
+            status=symbol_info['status'],
+            tick_size=float(tick_size) if tick_size else None,
+            step_size=float(step_size) if step_size else None
+        ))
+    return entries
+
+class SymbolIndex:
+    def __init__(self, symbols: List[str]):
+        self.symbols = sorted(set(symbols))
+        suffixes = [
+            (symbol[offset:], position)
+            for position, symbol in enumerate(self.symbols)
+            for offset in range(len(symbol))
+        ]
+        suffixes.sort()
+        self._suffixes = [suffix for suffix, _ in suffixes]
+        self._owners = [position for _, position in suffixes]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _prefix_range(self, values: List[str], prefix: str) -> Tuple[int, int]:
+        return bisect_left(values, prefix), bisect_right(values, prefix + '\uffff')
+
+    def prefix(self, query: str) -> List[str]:
+        start, stop = self._prefix_range(self.symbols, query.upper())
+        return self.symbols[start:stop]
+
+    def search(self, query: str) -> List[str]:
+        query = query.upper()
+        if not query:
+            return self.symbols
+        start, stop = self._prefix_range(self._suffixes, query)
+        return [self.symbols[position] for position in sorted(set(self._owners[start:stop]))]
+
+class SymbolCatalogue:
+    def __init__(self, sync_interval: float = 3600.0, retry_delay: float = 30.0):
+        self.sync_interval = sync_interval
+        self.retry_delay = retry_delay
+        self.entries: Dict[str, SymbolEntry] = {}
+        self.index = SymbolIndex([])
+        self.last_attempt = None
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load(self, entries: List[SymbolEntry]):
+        tradable = [e.symbol for e in entries if e.status == 'TRADING' and e.quote_asset == 'USDT']
+        self.entries = {entry.symbol: entry for entry in entries}
+        self.index = SymbolIndex(tradable)
+
+    def load_from_db(self) -> int:
+        entries = [
+            SymbolEntry(
+                symbol=row.symbol,
+                base_asset=row.base_asset,
+                quote_asset=row.quote_asset,
+                status=row.status,
+                tick_size=float(row.tick_size) if row.tick_size is not None else None,
+                step_size=float(row.step_size) if row.step_size is not None else None
+            )
+            for row in Symbol.objects.filter(is_active=True)
+        ]
+        self._load(entries)
+        return len(entries)
+
+    def sync(self) -> int:
+        entries = parse_exchange_info(BinanceClient().get_exchange_info())
+        if not entries:
+            return 0
+
+        now = timezone.now()
+        Symbol.objects.bulk_create(
+            [
+                Symbol(
+                    symbol=entry.symbol,
+                    base_asset=entry.base_asset,
+                    quote_asset=entry.quote_asset,
+                    status=entry.status,
+                    tick_size=Decimal(str(entry.tick_size)) if entry.tick_size else None,
+                    step_size=Decimal(str(entry.step_size)) if entry.step_size else None,
+                    is_active=True,
+                    last_updated=now
+                )
+                for entry in entries
+            ],
+            update_conflicts=True,
+            unique_fields=['symbol'],
+            update_fields=['base_asset', 'quote_asset', 'status', 'tick_size', 'step_size', 'is_active', 'last_updated'],
+            batch_size=500
+        )
+        Symbol.objects.filter(last_updated__lt=now).update(is_active=False)
+        self._load(entries)
+        logger.info(f"Symbol catalogue synced: {len(entries)} symbols")
+        return len(entries)
+
+    def refresh(self) -> int:
+        newest = Symbol.objects.filter(is_active=True).order_by('-last_updated').values_list('last_updated', flat=True).first()
+        if newest is None or timezone.now() - newest > timedelta(seconds=self.sync_interval):
+            return self.sync()
+        return self.load_from_db()
+
+    def _next_delay(self) -> float:
+        if not self._failures:
+            return self.sync_interval
+        return min(self.retry_delay * 2 ** (self._failures - 1), self.sync_interval)
+
+    def _run(self):
+        while True:
+            self.last_attempt = time.monotonic()
+            try:
+                if not self.refresh():
+                    raise ValueError("exchange info returned no symbols")
+                self._failures = 0
+            except Exception as e:
+                self._failures += 1
+                logger.error(f"Symbol catalogue sync failed (attempt {self._failures}): {str(e)}")
+            finally:
+                close_old_connections()
+            time.sleep(max(self.last_attempt + self._next_delay() - time.monotonic(), 0.0))
+
+    def ensure_ready(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            # Requests only ever see what is already stored; Binance is synced from the background thread.
+            try:
+                self.load_from_db()
+            except Exception as e:
+                logger.warning(f"Symbol catalogue not loaded from database: {str(e)}")
+            self._thread = threading.Thread(target=self._run, name='symbol-catalogue', daemon=True)
+            self._thread.start()
+
+    def search(self, query: str = '', limit: int = 50) -> Tuple[List[str], int]:
+        self.ensure_ready()
+        matches = self.index.search(query)
+        return matches[:limit], len(matches)
+
+    def get(self, symbol: str) -> Optional[SymbolEntry]:
+        self.ensure_ready()
+        return self.entries.get(symbol.upper())
+
+symbol_catalogue = SymbolCatalogue(settings.SYMBOL_SYNC_INTERVAL, settings.SYMBOL_SYNC_RETRY_DELAY)
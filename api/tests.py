@@ -0,0 +1,75 @@
+import itertools
+import random
+import time
+from django.test import SimpleTestCase
+from .symbol_catalogue import SymbolCatalogue, SymbolEntry, SymbolIndex
+
+def wait_for(condition, timeout: float = 5.0, interval: float = 0.01) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return False
+
+class SymbolIndexTests(SimpleTestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.symbols = ["".join(rng.choices("ABCDEU", k=rng.randint(2, 6))) + "USDT" for _ in range(300)]
+        self.index = SymbolIndex(self.symbols)
+        self.queries = [""] + ["".join(chars) for size in (1, 2, 3) for chars in itertools.product("abcdeust", repeat=size)]
+
+    def test_search_matches_substring_filter(self):
+        for query in self.queries:
+            expected = sorted({symbol for symbol in self.symbols if query.upper() in symbol})
+            self.assertEqual(self.index.search(query), expected, query)
+
+    def test_prefix_matches_startswith_filter(self):
+        for query in self.queries:
+            expected = sorted({symbol for symbol in self.symbols if symbol.startswith(query.upper())})
+            self.assertEqual(self.index.prefix(query), expected, query)
+
+class StubCatalogue(SymbolCatalogue):
+    def __init__(self, results, max_attempts: int = 5, **options):
+        super().__init__(**options)
+        self.results = list(results)
+        self.max_attempts = max_attempts
+        self.attempts = []
+
+    def load_from_db(self) -> int:
+        return 0
+
+    def _next_delay(self) -> float:
+        return super()._next_delay() if len(self.attempts) < self.max_attempts else self.sync_interval
+
+    def refresh(self) -> int:
+        self.attempts.append(time.monotonic())
+        result = self.results.pop(0) if self.results else ConnectionError("exchange unavailable")
+        if isinstance(result, Exception):
+            raise result
+        self._load(result)
+        return len(result)
+
+class SymbolCatalogueTests(SimpleTestCase):
+    entry = SymbolEntry("BTCUSDT", "BTC", "USDT", "TRADING", 0.01, 0.00001)
+
+    def test_requests_never_wait_for_binance(self):
+        catalogue = StubCatalogue([], sync_interval=3600, retry_delay=0.05)
+        with self.assertLogs("trading_analysis", level="ERROR"):
+            self.assertEqual(catalogue.search("BTC"), ([], 0))
+            self.assertIsNone(catalogue.get("BTCUSDT"))
+            self.assertTrue(wait_for(lambda: len(catalogue.attempts) >= 3))
+
+        gaps = [later - earlier for earlier, later in zip(catalogue.attempts, catalogue.attempts[1:])]
+        self.assertGreaterEqual(gaps[1], gaps[0])
+        self.assertIsNotNone(catalogue.last_attempt)
+
+    def test_background_sync_fills_the_index(self):
+        catalogue = StubCatalogue([ConnectionError("exchange unavailable"), [self.entry]], sync_interval=3600, retry_delay=0.01)
+        with self.assertLogs("trading_analysis", level="ERROR"):
+            catalogue.ensure_ready()
+            self.assertTrue(wait_for(lambda: len(catalogue.index) == 1))
+
+        self.assertEqual(catalogue.search("btc"), (["BTCUSDT"], 1))
+        self.assertEqual(catalogue.get("btcusdt"), self.entry)
+        self.assertEqual(catalogue._failures, 0)
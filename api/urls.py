@@ -10,4 +10,5 @@ urlpatterns = [
     path('analysis/result/<int:pk>/', views.AnalysisResultDetailView.as_view(), name='analysis_result'),
     path('symbols/', views.get_symbols, name='symbols'),
     path('market-data/<str:symbol>/', views.get_market_data, name='market_data'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -2,22 +2,66 @@ from rest_framework import status, generics
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.conf import settings
+from django.http import HttpResponse
 import logging
+import math
 
 from .models import AnalysisRequest, AnalysisResult, Symbol
+from .symbol_catalogue import symbol_catalogue
 from .serializers import (
     AnalysisRequestSerializer, AnalysisResultSerializer, 
     SymbolSerializer, GenerateAnalysisSerializer, SymbolListSerializer
 )
-from market_data.client import BinanceClient
-from market_data.data_processor import parse_klines_to_ohlc, calculate_volume_profile
+from market_data.async_client import async_binance_client, run_concurrently
+from market_data.data_processor import calculate_volume_profile, calculate_composite_profile
+from market_data.composite_profile import parse_range
+from market_data.intervals import interval_to_ms
+from market_data.depth_codec import encode_depth
+from market_data.exceptions import BinanceAPIError
+from market_data.metrics import CONTENT_TYPE, render_metrics
+from market_data.order_book import depth_streams
+from market_data.order_book_analytics import liquidity_summary
+from market_data.volume_profile import PROFILE_MODES
 from analysis.methods.elliott_wave import ElliottWaveAnalyzer
 from analysis.methods.volume_cluster import VolumeClusterAnalyzer
 from analysis.methods.smart_money import SmartMoneyAnalyzer
 from analysis.ai.claude_client import ClaudeClient
+from analysis.utils.error_handler import ErrorHandler, ERROR_HTTP_STATUS
 
 logger = logging.getLogger('trading_analysis')
 
+def get_catalogue_entry(symbol):
+    try:
+        return symbol_catalogue.get(symbol)
+    except Exception as e:
+        logger.warning(f"Symbol catalogue unavailable: {str(e)}")
+        return None
+
+def get_catalogue_tick_size(symbol):
+    entry = get_catalogue_entry(symbol)
+    return entry.tick_size if entry else None
+
+async def get_tick_size(symbol, tick_size=None):
+    if tick_size:
+        return tick_size
+    try:
+        return await async_binance_client.get_tick_size(symbol)
+    except Exception as e:
+        logger.warning(f"Tick size unavailable for {symbol}: {str(e)}")
+        return None
+
+async def get_order_book(symbol, limit, stream=False):
+    # Replayed runs must not open live websocket streams.
+    stream = stream and settings.ORDER_BOOK_STREAM_ENABLED and settings.MARKET_DATA_TRANSPORT != 'replay'
+    if stream and depth_streams.subscribe(symbol):
+        book = depth_streams.get_book(symbol)
+        if book is not None:
+            return book.to_dict(limit)
+    try:
+        return await async_binance_client.get_order_book(symbol, limit)
+    except Exception:
+        return {}
+
 class AnalysisRequestListView(generics.ListCreateAPIView):
     queryset = AnalysisRequest.objects.all()
     serializer_class = AnalysisRequestSerializer
@@ -51,12 +95,15 @@ def generate_analysis(request):
             status='processing'
         )
         
-        binance_client = BinanceClient()
-        
-        klines_data = binance_client.get_klines(symbol, timeframe, settings.DEFAULT_KLINES_LIMIT)
-        ohlc_data = parse_klines_to_ohlc(klines_data)
+        # Only listed, trading symbols get a websocket stream; anything else would hold a slot forever.
+        catalogue_entry = get_catalogue_entry(symbol)
+        ohlc_frame, order_book_data, tick_size = run_concurrently(
+            async_binance_client.get_candles(symbol, timeframe, settings.DEFAULT_KLINES_LIMIT),
+            get_order_book(symbol, 1000, stream=catalogue_entry is not None and catalogue_entry.status == 'TRADING'),
+            get_tick_size(symbol, catalogue_entry.tick_size if catalogue_entry else None)
+        )
         
-        if not ohlc_data:
+        if not ohlc_frame:
             analysis_request.status = 'failed'
             analysis_request.save()
             return Response(
@@ -64,23 +111,18 @@ def generate_analysis(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        current_price = ohlc_data[-1]['close']
-        
-        try:
-            order_book_data = binance_client.get_order_book(symbol, 1000)
-        except Exception:
-            order_book_data = {}
+        current_price = float(ohlc_frame.close[-1])
         
         market_data = {
             'symbol': symbol,
             'current_price': current_price,
-            'ohlc_data': ohlc_data,
-            'order_book': order_book_data
+            'ohlc_data': ohlc_frame.to_dicts(),
+            'order_book': encode_depth(order_book_data, tick_size=tick_size)
         }
         
         if method == 'elliott_wave':
-            analyzer = ElliottWaveAnalyzer()
-            analysis_data = analyzer.analyze(ohlc_data, timeframe)
+            analyzer = ElliottWaveAnalyzer(symbol=symbol)
+            analysis_data = analyzer.analyze(ohlc_frame, timeframe)
             market_data['analysis_data'] = {
                 'wave_structure': analysis_data.get('wave_structure', {}),
                 'fibonacci_levels': analysis_data.get('fibonacci_levels', {}),
@@ -89,18 +131,25 @@ def generate_analysis(request):
             }
         
         elif method == 'volume_cluster':
-            analyzer = VolumeClusterAnalyzer()
-            analysis_data = analyzer.analyze(ohlc_data, order_book_data, timeframe)
+            analyzer = VolumeClusterAnalyzer(
+                mode=settings.VOLUME_PROFILE_MODE,
+                tick_size=tick_size,
+                symbol=symbol
+            )
+            analysis_data = analyzer.analyze(ohlc_frame, order_book_data, timeframe)
             market_data['analysis_data'] = {
                 'volume_profile': analysis_data.get('volume_profile', {}),
+                'composite_profiles': analysis_data.get('composite_profiles', {}),
                 'key_levels': analysis_data.get('key_levels', {}),
+                # The depth shape is already stored packed under market_data['order_book'].
+                'order_book_liquidity': liquidity_summary(analysis_data.get('order_book_liquidity', {})),
                 'market_position': analysis_data.get('market_position', {}),
                 'trading_signals': analysis_data.get('trading_signals', {})
             }
         
         elif method == 'smart_money':
-            analyzer = SmartMoneyAnalyzer()
-            analysis_data = analyzer.analyze(ohlc_data, timeframe)
+            analyzer = SmartMoneyAnalyzer(symbol=symbol)
+            analysis_data = analyzer.analyze(ohlc_frame, timeframe)
             market_data['analysis_data'] = {
                 'order_blocks': analysis_data.get('order_blocks', []),
                 'fair_value_gaps': analysis_data.get('fair_value_gaps', []),
@@ -133,6 +182,13 @@ def generate_analysis(request):
             'timestamp': analysis_result.analysis_timestamp
         }, status=status.HTTP_201_CREATED)
         
+    except BinanceAPIError as e:
+        if 'analysis_request' in locals():
+            analysis_request.status = 'failed'
+            analysis_request.save()
+        error = ErrorHandler.handle_binance_error(e)
+        return Response(error, status=ERROR_HTTP_STATUS[error['error_code']])
+        
     except Exception as e:
         logger.error(f"Analysis generation failed: {str(e)}")
         if 'analysis_request' in locals():
@@ -154,17 +210,11 @@ def get_symbols(request):
     limit = serializer.validated_data.get('limit', 50)
     
     try:
-        binance_client = BinanceClient()
-        all_symbols = binance_client.get_symbols()
-        
-        if search:
-            filtered_symbols = [s for s in all_symbols if search.upper() in s]
-        else:
-            filtered_symbols = all_symbols
+        symbols, total = symbol_catalogue.search(search, limit)
         
         return Response({
-            'symbols': filtered_symbols[:limit],
-            'total': len(filtered_symbols)
+            'symbols': symbols,
+            'total': total
         })
         
     except Exception as e:
@@ -184,30 +234,67 @@ def get_market_data(request, symbol):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    profile_mode = request.query_params.get('profile_mode', settings.VOLUME_PROFILE_MODE)
+    
+    if profile_mode not in PROFILE_MODES:
+        return Response(
+            {'error': f'Profile mode must be one of: {", ".join(PROFILE_MODES)}'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    range_ms = None
+    klines_limit = 100
+    
+    if request.query_params.get('range'):
+        try:
+            range_ms = parse_range(request.query_params['range'])
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        klines_limit = min(max(math.ceil(range_ms / interval_to_ms(timeframe)) + 1, klines_limit), settings.MAX_KLINES_HISTORY)
+    
     try:
-        binance_client = BinanceClient()
-        
-        klines_data = binance_client.get_klines(symbol.upper(), timeframe, 100)
-        ohlc_data = parse_klines_to_ohlc(klines_data)
-        
-        volume_profile = calculate_volume_profile(ohlc_data)
+        ohlc_frame, ticker_data, tick_size = run_concurrently(
+            async_binance_client.get_candles(symbol.upper(), timeframe, klines_limit),
+            async_binance_client.get_24hr_ticker(symbol.upper()),
+            get_tick_size(symbol.upper(), get_catalogue_tick_size(symbol.upper()))
+        )
         
-        ticker_data = binance_client.get_24hr_ticker(symbol.upper())
+        volume_profile = calculate_volume_profile(
+            ohlc_frame[-100:],
+            mode=profile_mode,
+            tick_size=tick_size,
+            symbol=symbol.upper(),
+            interval=timeframe
+        )
         
-        return Response({
+        response_data = {
             'symbol': symbol.upper(),
             'timeframe': timeframe,
             'current_price': float(ticker_data.get('lastPrice', 0)),
             'price_change_24h': float(ticker_data.get('priceChange', 0)),
             'price_change_percent_24h': float(ticker_data.get('priceChangePercent', 0)),
             'volume_24h': float(ticker_data.get('volume', 0)),
-            'ohlc_data': ohlc_data[-50:],
+            'ohlc_data': ohlc_frame[-50:].to_dicts(),
             'volume_profile': volume_profile
-        })
+        }
+        
+        if range_ms:
+            response_data['composite_profile'] = calculate_composite_profile(
+                ohlc_frame, symbol.upper(), timeframe, range_ms, tick_size=tick_size
+            )
+        
+        return Response(response_data)
+        
+    except BinanceAPIError as e:
+        error = ErrorHandler.handle_binance_error(e)
+        return Response(error, status=ERROR_HTTP_STATUS[error['error_code']])
         
     except Exception as e:
         logger.error(f"Failed to fetch market data for {symbol}: {str(e)}")
         return Response(
             {'error': 'Failed to fetch market data'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+def metrics(request):
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
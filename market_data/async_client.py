@@ -0,0 +1,367 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+import httpx
+import numpy as np
+from django.conf import settings
+from .cache import DjangoCacheBackend, LRUCacheBackend, ResponseCache, ResponseCachePolicy, MISSING
+from .candle_store import CandleStore
+from .exceptions import (
+    BinanceClientError, BinanceConnectionError, BinanceRateLimitError, BinanceServerError, BinanceTimeoutError
+)
+from .frame import OhlcvFrame
+from .hedging import HedgedRouter
+from .intervals import interval_to_ms, now_ms
+from .kline_decoder import decode_kline_stream, json_loads
+from .rate_limiter import endpoint_weight, FileBackend, MemoryBackend, WeightRateLimiter
+from .request_policy import RequestPolicy, RetryPolicy
+from .resample import can_resample, missing_candles, resample
+from .singleflight import request_key, AsyncSingleFlight
+from .transport import build_transport
+
+logger = logging.getLogger('trading_analysis')
+
+MAX_KLINES_LIMIT = 1000
+KLINES_ENDPOINT = "/api/v3/klines"
+
+candle_store = CandleStore(settings.CANDLE_STORE_DIR)
+
+rate_limiter = WeightRateLimiter(
+    settings.BINANCE_RATE_LIMIT,
+    backend=FileBackend(settings.BINANCE_RATE_LIMIT_FILE) if settings.BINANCE_RATE_LIMIT_BACKEND == 'file' else MemoryBackend()
+)
+
+response_cache = ResponseCache(
+    DjangoCacheBackend(settings.MARKET_DATA_CACHE_ALIAS) if settings.MARKET_DATA_CACHE_BACKEND == 'django'
+    else LRUCacheBackend(settings.MARKET_DATA_CACHE_MAX_ENTRIES, settings.MARKET_DATA_CACHE_MAX_BYTES),
+    ResponseCachePolicy(
+        forming_kline_ttl=settings.MARKET_DATA_CACHE_FORMING_KLINE_TTL,
+        ticker_ttl=settings.MARKET_DATA_CACHE_TICKER_TTL,
+        depth_ttl=settings.MARKET_DATA_CACHE_DEPTH_TTL,
+        exchange_info_ttl=settings.MARKET_DATA_CACHE_EXCHANGE_INFO_TTL,
+        cache_closed_klines=not settings.CANDLE_STORE_ENABLED
+    )
+)
+
+request_policy = RequestPolicy(
+    RetryPolicy(
+        max_retries=settings.BINANCE_MAX_RETRIES,
+        base_delay=settings.BINANCE_RETRY_BASE_DELAY,
+        max_delay=settings.BINANCE_RETRY_MAX_DELAY
+    ),
+    failure_threshold=settings.BINANCE_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.BINANCE_CIRCUIT_RESET_TIMEOUT
+)
+
+T = TypeVar("T")
+
+class _EventLoopThread:
+    def __init__(self, name: str):
+        self.name = name
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True).start()
+            return self._loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop()).result()
+
+_io_loop = _EventLoopThread("binance-io")
+
+def run_sync(coro: Awaitable[T]) -> T:
+    return _io_loop.run(coro)
+
+def run_background(coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+    return asyncio.run_coroutine_threadsafe(coro, _io_loop.loop())
+
+def run_concurrently(*coros: Awaitable) -> List:
+    async def gather():
+        return await asyncio.gather(*coros)
+    return run_sync(gather())
+
+class AsyncBinanceClient:
+    def __init__(self, base_url: Optional[str] = None, base_urls: Optional[List[str]] = None):
+        if base_urls is None:
+            base_urls = [base_url] if base_url else (
+                settings.BINANCE_BASE_URLS if settings.BINANCE_HEDGING_ENABLED else [settings.BINANCE_BASE_URL]
+            )
+        self.base_url = base_urls[0]
+        self.router = HedgedRouter(
+            base_urls,
+            percentile=settings.BINANCE_HEDGE_PERCENTILE,
+            min_delay=settings.BINANCE_HEDGE_MIN_DELAY,
+            max_delay=settings.BINANCE_HEDGE_MAX_DELAY
+        )
+        self._client = None
+        self._client_loop = None
+        self._in_flight = AsyncSingleFlight()
+        self._tick_sizes: Dict[str, float] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                self._close_stale_client(self._client, self._client_loop)
+            limits = httpx.Limits(
+                max_connections=settings.BINANCE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.BINANCE_MAX_CONNECTIONS
+            )
+            self._client = httpx.AsyncClient(
+                http2=settings.BINANCE_HTTP2,
+                timeout=httpx.Timeout(settings.BINANCE_TIMEOUT, connect=settings.BINANCE_CONNECT_TIMEOUT),
+                limits=limits,
+                transport=build_transport("binance", http2=settings.BINANCE_HTTP2, limits=limits),
+                headers={'User-Agent': 'TradingAnalysis/1.0'}
+            )
+            self._client_loop = loop
+        return self._client
+
+    @staticmethod
+    def _close_stale_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+        # Pooled connections are bound to the loop that opened them, so the old client is closed there.
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            logger.debug("Dropping HTTP client of a stopped event loop")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    async def _make_request(self, endpoint: str, params: Dict = None, fresh: bool = False) -> Dict:
+        key = request_key(endpoint, params)
+        payload = MISSING if fresh else response_cache.get(endpoint, key)
+        if payload is MISSING:
+            payload = await self._in_flight.do(key, lambda: self._fetch(endpoint, params))
+        return payload
+
+    async def _send(self, client: httpx.AsyncClient, url: str, endpoint: str, params: Dict = None):
+        # Klines are decoded straight from the byte stream into a (rows, 12) float array.
+        async with client.stream("GET", url, params=params) as response:
+            if endpoint == KLINES_ENDPOINT and response.status_code == 200:
+                return response, await decode_kline_stream(response.aiter_bytes())
+            await response.aread()
+            return response, None
+
+    async def _fetch(self, endpoint: str, params: Dict = None) -> Dict:
+        weight = endpoint_weight(endpoint, params)
+        payload, size = await request_policy.call(
+            endpoint,
+            lambda: self._attempt(endpoint, params, weight),
+            acquire=lambda: rate_limiter.acquire(weight)
+        )
+        response_cache.set(endpoint, request_key(endpoint, params), params or {}, payload, now_ms(), size)
+        return payload
+
+    async def _attempt(self, endpoint: str, params: Dict, weight: int) -> Tuple[Any, int]:
+        client = self.client
+        try:
+            response, payload = await self.router.request(
+                lambda host: self._send(client, f"{host}{endpoint}", endpoint, params),
+                can_hedge=lambda: rate_limiter.try_reserve(weight),
+                label=endpoint,
+                is_failure=lambda result: result[0].status_code >= 500
+            )
+        except httpx.TimeoutException as e:
+            logger.error(f"Binance API timeout: {endpoint} | {e}")
+            raise BinanceTimeoutError(f"Binance API timed out: {endpoint}")
+        except httpx.HTTPError as e:
+            logger.error(f"Binance API error: {e}")
+            raise BinanceConnectionError(f"Binance API unavailable: {str(e)}")
+
+        used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M')
+        retry_after = response.headers.get('Retry-After')
+        rate_limited = response.status_code in (418, 429)
+        rate_limiter.sync(
+            int(used_weight) if used_weight else None,
+            float(retry_after) if rate_limited and retry_after else None
+        )
+
+        if rate_limited:
+            logger.error(f"Binance rate limit hit: {response.status_code} | retry after {retry_after}s")
+            raise BinanceRateLimitError(
+                f"Binance API rate limit exceeded: {response.status_code}",
+                response.status_code,
+                float(retry_after) if retry_after else None
+            )
+        if response.status_code >= 500:
+            logger.error(f"Binance API server error: {response.status_code} | {endpoint}")
+            raise BinanceServerError(f"Binance API server error: {response.status_code}", response.status_code)
+        if response.status_code >= 400:
+            logger.error(f"Binance API rejected request: {response.status_code} | {endpoint} | {response.text[:200]}")
+            raise BinanceClientError(f"Binance API rejected request: {response.status_code}", response.status_code)
+
+        # The cache is bounded by the decoded array size for klines and by the body length for JSON payloads.
+        if payload is not None:
+            return payload, payload.nbytes
+        return json_loads(response.content), len(response.content)
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 100,
+                         start_time: Optional[int] = None, end_time: Optional[int] = None) -> np.ndarray:
+        endpoint = KLINES_ENDPOINT
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "limit": limit
+        }
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        logger.info(f"Fetching klines: {symbol} | {interval} | {limit}")
+        return await self._make_request(endpoint, params)
+
+    async def get_candles(self, symbol: str, interval: str, limit: int = 100, closed_only: bool = False) -> OhlcvFrame:
+        interval_ms = interval_to_ms(interval)
+        now = now_ms()
+
+        if not settings.CANDLE_STORE_ENABLED:
+            frame = await self._get_latest_candles(symbol, interval, limit, now)
+            if closed_only:
+                frame = frame[:int(np.searchsorted(frame.timestamp + interval_ms, now, side="right"))]
+            return frame
+
+        # Higher timeframes are exact aggregates of the stored base candles, so build them locally.
+        base_interval = settings.RESAMPLE_BASE_INTERVAL
+        if base_interval and interval != base_interval and can_resample(base_interval, interval):
+            base_limit = (limit + 1) * (interval_ms // interval_to_ms(base_interval))
+            # Large ratios would pull thousands of base candles on a cold store; the native interval is cheaper.
+            if base_limit <= min(settings.RESAMPLE_MAX_BASE_CANDLES, settings.MAX_KLINES_HISTORY):
+                base = await self.get_candles(symbol, base_interval, base_limit)
+                missing = missing_candles(base.timestamp, base_interval)
+                if not missing:
+                    frame = resample(base, base_interval, interval)
+                    if closed_only:
+                        frame = frame[:int(np.searchsorted(frame.timestamp + interval_ms, now, side="right"))]
+                    return frame[-limit:]
+                logger.warning(f"{symbol} {base_interval} history has {missing} missing candles, fetching {interval} directly")
+
+        stored = candle_store.read(symbol, interval)
+        if not stored:
+            fetched = await self._get_latest_candles(symbol, interval, limit, now)
+        else:
+            start = int(stored.timestamp[-1]) + interval_ms
+            missing = (now - int(stored.timestamp[-1])) // interval_ms
+            if missing > MAX_KLINES_LIMIT:
+                # Catch up the tail after downtime, but never further back than the history window.
+                start += max(missing - max(settings.MAX_KLINES_HISTORY, limit), 0) * interval_ms
+                fetched = await self.get_klines_range(symbol, interval, start, now)
+            else:
+                fetched = OhlcvFrame.from_klines(await self.get_klines(symbol, interval, max(missing, 1), start_time=start))
+
+        closed_count = int(np.searchsorted(fetched.timestamp + interval_ms, now, side="right"))
+        if candle_store.append(symbol, interval, fetched[:closed_count]):
+            stored = candle_store.read(symbol, interval)
+
+        forming = fetched[closed_count:]
+        shortfall = limit - len(forming) - len(stored)
+        if stored and shortfall > 0 and not candle_store.at_history_start(symbol, interval):
+            first = int(stored.timestamp[0])
+            backfill_start = first - shortfall * interval_ms
+            older = await self.get_klines_range(symbol, interval, backfill_start, first - 1)
+            # Nothing traded before the first returned candle (a recent listing), so stop asking for older history.
+            if not older or older.timestamp[0] > backfill_start:
+                candle_store.mark_history_start(symbol, interval)
+            if candle_store.prepend(symbol, interval, older):
+                stored = candle_store.read(symbol, interval)
+
+        if closed_only or not forming:
+            return stored[-limit:]
+        tail = max(limit - len(forming), 0)
+        return OhlcvFrame.concat([stored[max(len(stored) - tail, 0):], forming])
+
+    async def _get_latest_candles(self, symbol: str, interval: str, limit: int, now: int) -> OhlcvFrame:
+        if limit <= MAX_KLINES_LIMIT:
+            return OhlcvFrame.from_klines(await self.get_klines(symbol, interval, limit))
+        interval_ms = interval_to_ms(interval)
+        return await self.get_klines_range(symbol, interval, now - now % interval_ms - (limit - 1) * interval_ms, now)
+
+    async def get_klines_range(self, symbol: str, interval: str, start: int, end: Optional[int] = None) -> OhlcvFrame:
+        interval_ms = interval_to_ms(interval)
+        end = now_ms() if end is None else end
+        if end < start:
+            return OhlcvFrame.empty()
+
+        page_ms = MAX_KLINES_LIMIT * interval_ms
+        windows = [(page_start, min(page_start + page_ms - 1, end)) for page_start in range(start, end + 1, page_ms)]
+        logger.info(f"Fetching kline range: {symbol} | {interval} | {start}-{end} | {len(windows)} pages")
+
+        semaphore = asyncio.Semaphore(max(1, settings.BINANCE_MAX_CONCURRENCY))
+
+        async def fetch_page(window):
+            async with semaphore:
+                return OhlcvFrame.from_klines(await self.get_klines(
+                    symbol, interval, MAX_KLINES_LIMIT, start_time=window[0], end_time=window[1]
+                ))
+
+        frame = OhlcvFrame.concat(await asyncio.gather(*(fetch_page(window) for window in windows)))
+        if not frame:
+            return frame
+
+        timestamps, first_rows = np.unique(frame.timestamp, return_index=True)
+        if len(timestamps) != len(frame):
+            frame = frame[first_rows]
+
+        gaps = np.flatnonzero(np.diff(frame.timestamp) != interval_ms)
+        if len(gaps):
+            missing = int(((np.diff(frame.timestamp)[gaps] // interval_ms) - 1).sum())
+            logger.warning(f"Kline range has {len(gaps)} gaps ({missing} candles missing): {symbol} | {interval}")
+        return frame
+
+    async def get_order_book(self, symbol: str, limit: int = 1000, fresh: bool = False) -> Dict:
+        endpoint = "/api/v3/depth"
+        params = {
+            "symbol": symbol,
+            "limit": limit
+        }
+        logger.info(f"Fetching order book: {symbol} | {limit}")
+        return await self._make_request(endpoint, params, fresh)
+
+    async def get_24hr_ticker(self, symbol: str) -> Dict:
+        endpoint = "/api/v3/ticker/24hr"
+        params = {"symbol": symbol}
+        logger.info(f"Fetching 24hr ticker: {symbol}")
+        return await self._make_request(endpoint, params)
+
+    async def get_exchange_info(self, symbol: Optional[str] = None) -> Dict:
+        endpoint = "/api/v3/exchangeInfo"
+        params = {"symbol": symbol} if symbol else None
+        return await self._make_request(endpoint, params)
+
+    async def get_symbol_filters(self, symbol: str) -> Dict[str, Dict]:
+        exchange_info = await self.get_exchange_info(symbol)
+        for symbol_info in exchange_info.get('symbols', []):
+            if symbol_info['symbol'] == symbol:
+                return {f['filterType']: f for f in symbol_info.get('filters', [])}
+        return {}
+
+    async def get_tick_size(self, symbol: str) -> Optional[float]:
+        if symbol not in self._tick_sizes:
+            price_filter = (await self.get_symbol_filters(symbol)).get('PRICE_FILTER')
+            if not price_filter:
+                return None
+            self._tick_sizes[symbol] = float(price_filter['tickSize'])
+        return self._tick_sizes[symbol]
+
+    async def get_symbols(self) -> List[str]:
+        exchange_info = await self.get_exchange_info()
+        symbols = []
+        for symbol_info in exchange_info['symbols']:
+            if symbol_info['status'] == 'TRADING' and symbol_info['quoteAsset'] == 'USDT':
+                symbols.append(symbol_info['symbol'])
+        return sorted(symbols)
+
+async_binance_client = AsyncBinanceClient()
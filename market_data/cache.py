@@ -0,0 +1,152 @@
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import hashlib
+import logging
+import sys
+import threading
+import time
+import numpy as np
+
+logger = logging.getLogger('trading_analysis')
+
+MISSING = object()
+
+def payload_size(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+class LRUCacheBackend:
+    def __init__(self, max_entries: int = 2048, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _discard(self, key: Hashable):
+        self.size -= self._entries.pop(key)[2]
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._discard(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float], size: Optional[int] = None):
+        if self.max_bytes is None:
+            size = 0
+        elif size is None:
+            size = payload_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+                self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+class DjangoCacheBackend:
+    def __init__(self, alias: str = 'default', prefix: str = 'binance'):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+        self.prefix = prefix
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}:{hashlib.sha1(repr(key).encode()).hexdigest()}"
+
+    def get(self, key: Hashable) -> Any:
+        return self.cache.get(self._key(key), MISSING)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float], size: Optional[int] = None):
+        self.cache.set(self._key(key), value, ttl)
+
+    def clear(self):
+        self.cache.clear()
+
+class ResponseCachePolicy:
+    def __init__(self, forming_kline_ttl: float = 5.0, ticker_ttl: float = 2.0, depth_ttl: float = 1.0,
+                 exchange_info_ttl: float = 6 * 3600.0, cache_closed_klines: bool = True):
+        self.forming_kline_ttl = forming_kline_ttl
+        self.ticker_ttl = ticker_ttl
+        self.depth_ttl = depth_ttl
+        self.exchange_info_ttl = exchange_info_ttl
+        self.cache_closed_klines = cache_closed_klines
+
+    def ttl(self, endpoint: str, params: Dict, payload: Any, now_ms: int) -> Optional[float]:
+        if endpoint == "/api/v3/klines":
+            return self._klines_ttl(params, payload, now_ms)
+        if endpoint == "/api/v3/ticker/24hr":
+            return self.ticker_ttl
+        if endpoint == "/api/v3/depth":
+            return self.depth_ttl
+        if endpoint == "/api/v3/exchangeInfo":
+            return self.exchange_info_ttl
+        return 0.0
+
+    def _klines_ttl(self, params: Dict, payload: Any, now_ms: int) -> Optional[float]:
+        end_time = params.get("endTime")
+        window_closed = end_time is not None and end_time < now_ms
+        # Closed windows never change, but when the candle store persists them caching them again only costs memory.
+        closed_ttl = None if self.cache_closed_klines else 0.0
+        if not len(payload):
+            return closed_ttl if window_closed else self.forming_kline_ttl
+
+        last_close = int(payload[-1][6])
+        if last_close >= now_ms:
+            return max(min(self.forming_kline_ttl, (last_close + 1 - now_ms) / 1000), 0.0)
+        if window_closed or len(payload) >= int(params.get("limit", 500)):
+            return closed_ttl
+        return 0.0
+
+class ResponseCache:
+    def __init__(self, backend=None, policy: Optional[ResponseCachePolicy] = None):
+        self.backend = backend or LRUCacheBackend()
+        self.policy = policy or ResponseCachePolicy()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def get(self, endpoint: str, key: Hashable) -> Any:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            value = MISSING
+        if value is MISSING:
+            self._misses[endpoint] += 1
+        else:
+            self._hits[endpoint] += 1
+        return value
+
+    def set(self, endpoint: str, key: Hashable, params: Dict, payload: Any, now_ms: int, size: Optional[int] = None):
+        ttl = self.policy.ttl(endpoint, params, payload, now_ms)
+        if ttl is not None and ttl <= 0:
+            return
+        try:
+            self.backend.set(key, payload, ttl, size)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for endpoint in sorted(set(self._hits) | set(self._misses)):
+            hits, misses = self._hits[endpoint], self._misses[endpoint]
+            stats[endpoint] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0
+            }
+        return stats
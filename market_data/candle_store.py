@@ -0,0 +1,146 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+import fcntl
+import logging
+import os
+import re
+import shutil
+import numpy as np
+from .frame import OhlcvFrame, OHLCV_COLUMNS
+
+logger = logging.getLogger('trading_analysis')
+
+COLUMN_DTYPES = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+SERIES_KEY_PATTERN = re.compile(r"^[A-Za-z0-9]{1,30}$")
+
+class CandleStore:
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        if not SERIES_KEY_PATTERN.match(symbol) or not SERIES_KEY_PATTERN.match(interval):
+            raise ValueError(f"Invalid candle series: {symbol} {interval}")
+        return self.root / symbol.upper() / interval
+
+    def _column_path(self, series_dir: Path, column: str) -> Path:
+        return series_dir / f"{column}.bin"
+
+    def _history_start_path(self, series_dir: Path) -> Path:
+        return series_dir / ".history_start"
+
+    @contextmanager
+    def _locked(self, symbol: str, interval: str, exclusive: bool):
+        series_dir = self._series_dir(symbol, interval)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        with open(series_dir / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield series_dir
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _length(self, series_dir: Path) -> int:
+        lengths = []
+        for column in OHLCV_COLUMNS:
+            path = self._column_path(series_dir, column)
+            lengths.append(path.stat().st_size // COLUMN_DTYPES[column].itemsize if path.exists() else 0)
+        return min(lengths)
+
+    def read(self, symbol: str, interval: str) -> OhlcvFrame:
+        series_dir = self._series_dir(symbol, interval)
+        if not series_dir.exists():
+            return OhlcvFrame.empty()
+
+        with self._locked(symbol, interval, exclusive=False):
+            length = self._length(series_dir)
+            if not length:
+                return OhlcvFrame.empty()
+
+            return OhlcvFrame(*(
+                np.memmap(self._column_path(series_dir, column), dtype=COLUMN_DTYPES[column], mode="r", shape=(length,))
+                for column in OHLCV_COLUMNS
+            ))
+
+    def _read_timestamp(self, series_dir: Path, position: int) -> int:
+        itemsize = COLUMN_DTYPES["timestamp"].itemsize
+        with open(self._column_path(series_dir, "timestamp"), "rb") as handle:
+            handle.seek(position * itemsize)
+            return int(np.frombuffer(handle.read(itemsize), dtype=COLUMN_DTYPES["timestamp"])[0])
+
+    def append(self, symbol: str, interval: str, frame: OhlcvFrame) -> int:
+        if not frame:
+            return 0
+
+        with self._locked(symbol, interval, exclusive=True) as series_dir:
+            length = self._length(series_dir)
+            if length:
+                last = self._read_timestamp(series_dir, length - 1)
+                frame = frame[int(np.searchsorted(frame.timestamp, last, side="right")):]
+                if not frame:
+                    return 0
+
+            for column in OHLCV_COLUMNS:
+                path = self._column_path(series_dir, column)
+                with open(path, "r+b" if path.exists() else "wb") as handle:
+                    handle.truncate(length * COLUMN_DTYPES[column].itemsize)
+                    handle.seek(0, os.SEEK_END)
+                    handle.write(np.ascontiguousarray(getattr(frame, column), dtype=COLUMN_DTYPES[column]).tobytes())
+                    handle.flush()
+
+        logger.info(f"Candle store append: {symbol} | {interval} | {len(frame)}")
+        return len(frame)
+
+    def prepend(self, symbol: str, interval: str, frame: OhlcvFrame) -> int:
+        if not frame:
+            return 0
+
+        with self._locked(symbol, interval, exclusive=True) as series_dir:
+            length = self._length(series_dir)
+            if length:
+                first = self._read_timestamp(series_dir, 0)
+                frame = frame[:int(np.searchsorted(frame.timestamp, first, side="left"))]
+                if not frame:
+                    return 0
+
+            # Older candles go in front, so each column is rewritten to a staging file and swapped in.
+            staged = []
+            for column in OHLCV_COLUMNS:
+                path = self._column_path(series_dir, column)
+                staging = path.with_suffix(".tmp")
+                with open(staging, "wb") as handle:
+                    handle.write(np.ascontiguousarray(getattr(frame, column), dtype=COLUMN_DTYPES[column]).tobytes())
+                    if length:
+                        with open(path, "rb") as existing:
+                            handle.write(existing.read(length * COLUMN_DTYPES[column].itemsize))
+                    handle.flush()
+                staged.append((staging, path))
+            for staging, path in staged:
+                os.replace(staging, path)
+
+        logger.info(f"Candle store backfill: {symbol} | {interval} | {len(frame)}")
+        return len(frame)
+
+    def mark_history_start(self, symbol: str, interval: str):
+        with self._locked(symbol, interval, exclusive=True) as series_dir:
+            self._history_start_path(series_dir).touch()
+
+    def at_history_start(self, symbol: str, interval: str) -> bool:
+        return self._history_start_path(self._series_dir(symbol, interval)).exists()
+
+    def reset(self, symbol: str, interval: str):
+        with self._locked(symbol, interval, exclusive=True) as series_dir:
+            for path in [self._column_path(series_dir, column) for column in OHLCV_COLUMNS] + [self._history_start_path(series_dir)]:
+                if path.exists():
+                    path.unlink()
+
+    def clear(self):
+        if self.root.exists():
+            shutil.rmtree(self.root)
@@ -0,0 +1,219 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Union
+import math
+import re
+import threading
+import numpy as np
+from .frame import OhlcvFrame
+from .intervals import DAY_MS, HOUR_MS, WEEK_MS
+from .volume_profile import (
+    aligned_bin_size, overlap_histogram, tick_precision, value_area, DEFAULT_BINS, VALUE_AREA_RATIO
+)
+
+PERIOD_SESSION = "session"
+PERIOD_WEEKLY = "weekly"
+PERIOD_MONTHLY = "monthly"
+COMPOSITE_PERIODS = (PERIOD_SESSION, PERIOD_WEEKLY, PERIOD_MONTHLY)
+
+# Binance weeks start on Monday, 1970-01-05 is the first Monday after the epoch.
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+RANGE_UNITS_MS = {"h": HOUR_MS, "d": DAY_MS, "w": WEEK_MS}
+RANGE_PATTERN = re.compile(r"^(\d+)([hdw])$")
+
+def parse_range(value: str) -> int:
+    match = RANGE_PATTERN.match(value.strip().lower())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Range must look like 12h, 90d or 4w, got: {value}")
+    return int(match.group(1)) * RANGE_UNITS_MS[match.group(2)]
+
+def period_starts(timestamps: np.ndarray, period: str) -> np.ndarray:
+    if period == PERIOD_SESSION:
+        return timestamps - timestamps % DAY_MS
+    if period == PERIOD_WEEKLY:
+        return timestamps - (timestamps - WEEK_OFFSET_MS) % WEEK_MS
+    if period == PERIOD_MONTHLY:
+        months = timestamps.astype("datetime64[ms]").astype("datetime64[M]")
+        return months.astype("datetime64[ms]").astype(np.int64)
+    raise ValueError(f"Unknown composite period: {period}")
+
+class CompositeVolumeProfile:
+    def __init__(self, bin_size: float, period: str = PERIOD_SESSION, tick_size: Optional[float] = None,
+                 value_area_ratio: float = VALUE_AREA_RATIO):
+        if period not in COMPOSITE_PERIODS:
+            raise ValueError(f"Unknown composite period: {period}")
+        self.bin_size = bin_size
+        self.period = period
+        self.tick_size = tick_size
+        self.value_area_ratio = value_area_ratio
+        self.origin = 0
+        # Prefix sums live in an over-allocated buffer so appending a candle only writes the last row.
+        self._buffer = np.zeros((1, 0))
+        self._period_starts = np.zeros(0, dtype=np.int64)
+        self._rows = 1
+        self._left = 0
+        self._width = 0
+        self._last_period = OhlcvFrame.empty()
+
+    @classmethod
+    def from_frame(cls, ohlcv_data: Union[OhlcvFrame, Sequence[Dict]], period: str = PERIOD_SESSION,
+                   tick_size: Optional[float] = None, bins: int = DEFAULT_BINS) -> "CompositeVolumeProfile":
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        price_range = float(frame.high.max() - frame.low.min()) if frame else 0.0
+        if tick_size:
+            bin_size = aligned_bin_size(price_range, tick_size, bins)
+        else:
+            bin_size = price_range / bins or 1.0
+
+        profile = cls(bin_size, period, tick_size)
+        profile.extend(frame)
+        return profile
+
+    def _bin_index(self, price: float) -> int:
+        return math.floor(round(price / self.bin_size, 9))
+
+    @property
+    def prefix(self) -> np.ndarray:
+        return self._buffer[:self._rows, self._left:self._left + self._width]
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._period_starts[:self._rows - 1]
+
+    def _reserve(self, rows: int, left: int = 0, right: int = 0):
+        capacity, columns = self._buffer.shape
+        free_right = columns - self._left - self._width
+        if rows <= capacity and left <= self._left and right <= free_right:
+            return
+
+        # Grow geometrically so appends and widenings stay amortized O(bins).
+        capacity = max(rows, 2 * capacity) if rows > capacity else capacity
+        margin_left = max(left, self._width) if left > self._left else self._left
+        margin_right = max(right, self._width) if right > free_right else free_right
+        buffer = np.zeros((capacity, margin_left + self._width + margin_right))
+        buffer[:self._rows, margin_left:margin_left + self._width] = self.prefix
+        period_starts = np.zeros(capacity, dtype=np.int64)
+        period_starts[:self._rows - 1] = self.starts
+        self._buffer, self._period_starts, self._left = buffer, period_starts, margin_left
+
+    def _widen(self, first: int, last: int):
+        if not self._width:
+            self.origin = first
+            self._reserve(self._rows, right=last - first + 1)
+            self._width = last - first + 1
+            return
+
+        left = max(self.origin - first, 0)
+        right = max(last - (self.origin + self._width - 1), 0)
+        if left or right:
+            # Columns outside the window are never written, so the exposed bins start at zero.
+            self._reserve(self._rows, left, right)
+            self._left -= left
+            self._width += left + right
+            self.origin -= left
+
+    def extend(self, ohlcv_data: Union[OhlcvFrame, Sequence[Dict]]):
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        if not frame:
+            return
+
+        if len(self.starts):
+            frame = frame[int(np.searchsorted(frame.timestamp, self.starts[-1], side="left")):]
+            if not frame:
+                return
+            if self._last_period and frame and frame.timestamp[0] > self._last_period.timestamp[0]:
+                older = int(np.searchsorted(self._last_period.timestamp, frame.timestamp[0], side="left"))
+                frame = OhlcvFrame.concat([self._last_period[:older], frame])
+            self._rows -= 1
+
+        self._widen(self._bin_index(float(frame.low.min())), self._bin_index(float(frame.high.max())))
+        edges = (np.arange(self._width + 1) + self.origin) * self.bin_size
+
+        starts = period_starts(frame.timestamp, self.period)
+        boundaries = np.flatnonzero(np.diff(starts)) + 1
+        bounds = np.concatenate(([0], boundaries, [len(frame)]))
+        histograms = np.vstack([
+            overlap_histogram(frame[begin:end], edges) for begin, end in zip(bounds[:-1], bounds[1:])
+        ])
+
+        first, last = self._rows, self._rows + len(histograms)
+        self._reserve(last)
+        columns = slice(self._left, self._left + self._width)
+        self._buffer[first:last, columns] = self._buffer[first - 1, columns] + np.cumsum(histograms, axis=0)
+        self._period_starts[first - 1:last - 1] = starts[bounds[:-1]]
+        self._rows = last
+        self._last_period = frame[int(bounds[-2]):]
+
+    def _price_levels(self, start: int, stop: int) -> np.ndarray:
+        levels = (np.arange(start, stop) + self.origin + 0.5) * self.bin_size
+        if self.tick_size:
+            levels = np.round(levels, tick_precision(self.tick_size) + 1)
+        return levels
+
+    def query(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Dict:
+        first, last = 0, len(self.starts)
+        if start_ms is not None:
+            period_start = period_starts(np.array([start_ms], dtype=np.int64), self.period)[0]
+            first = int(np.searchsorted(self.starts, period_start, side="left"))
+        if end_ms is not None:
+            last = int(np.searchsorted(self.starts, end_ms, side="right"))
+        if last <= first:
+            return {}
+
+        volumes = self.prefix[last] - self.prefix[first]
+        occupied = np.flatnonzero(volumes > 0)
+        if not len(occupied):
+            return {}
+
+        volumes = volumes[occupied[0]:occupied[-1] + 1]
+        price_levels = self._price_levels(occupied[0], occupied[-1] + 1)
+        poc, vah, val = value_area(price_levels, volumes, self.value_area_ratio)
+
+        return {
+            "poc": poc,
+            "vah": vah,
+            "val": val,
+            "bin_size": self.bin_size,
+            "period": self.period,
+            "periods": last - first,
+            "start": int(self.starts[first]),
+            "price_levels": price_levels,
+            "volumes": volumes
+        }
+
+    def last(self, periods: int = 1) -> Dict:
+        if not len(self.starts):
+            return {}
+        return self.query(start_ms=int(self.starts[max(len(self.starts) - periods, 0)]))
+
+class CompositeProfileRegistry:
+    def __init__(self, max_profiles: int = 256):
+        self.max_profiles = max_profiles
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def query(self, symbol: str, interval: str, ohlcv_data: Union[OhlcvFrame, Sequence[Dict]],
+              period: str = PERIOD_SESSION, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+              last_periods: Optional[int] = None, tick_size: Optional[float] = None,
+              bins: int = DEFAULT_BINS) -> Dict:
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        if not frame:
+            return {}
+        key = (symbol, interval, period, tick_size, bins)
+
+        with self._lock:
+            profile = self._profiles.pop(key, None)
+            if profile is None or not len(profile.starts) or frame.timestamp[0] < profile.starts[0]:
+                profile = CompositeVolumeProfile.from_frame(frame, period, tick_size, bins)
+            else:
+                profile.extend(frame)
+
+            self._profiles[key] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+            if last_periods:
+                return profile.last(last_periods)
+            return profile.query(start_ms, end_ms)
+
+composite_profiles = CompositeProfileRegistry()
@@ -0,0 +1,63 @@
+from typing import Dict, Optional
+import base64
+import numpy as np
+from .order_book_analytics import bucket_depth, depth_arrays, mid_price, DEFAULT_MAX_BUCKETS
+from .volume_profile import tick_precision
+
+DEPTH_CODEC_VERSION = 1
+LEVEL_DTYPE = np.dtype("<f8")
+PROMPT_DEPTH_LEVELS = 10
+
+def _pack(prices: np.ndarray, quantities: np.ndarray) -> str:
+    levels = np.column_stack((prices, quantities)).astype(LEVEL_DTYPE)
+    return base64.b64encode(levels.tobytes()).decode("ascii")
+
+def _unpack(packed: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(packed), dtype=LEVEL_DTYPE).reshape(-1, 2)
+
+def encode_depth(order_book_data: Dict, tick_size: Optional[float] = None,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS) -> Dict:
+    depth = depth_arrays(order_book_data or {})
+    mid = mid_price(depth)
+    if mid is None:
+        return {}
+
+    bucket_size, bid_prices, bid_quantities, ask_prices, ask_quantities = bucket_depth(depth, mid, tick_size, max_buckets)
+    precision = tick_precision(bucket_size)
+
+    return {
+        "v": DEPTH_CODEC_VERSION,
+        "last_update_id": order_book_data.get("lastUpdateId"),
+        "mid": round(mid, precision + 1),
+        "bucket_size": bucket_size,
+        "bids": _pack(np.round(bid_prices, precision), bid_quantities),
+        "asks": _pack(np.round(ask_prices, precision), ask_quantities)
+    }
+
+def decode_depth(encoded: Dict) -> Dict:
+    if not encoded:
+        return {}
+    if encoded.get("v") != DEPTH_CODEC_VERSION:
+        raise ValueError(f"Unsupported depth codec version: {encoded.get('v')}")
+
+    return {
+        "lastUpdateId": encoded.get("last_update_id"),
+        "bucket_size": encoded["bucket_size"],
+        "bids": _unpack(encoded["bids"]).tolist(),
+        "asks": _unpack(encoded["asks"]).tolist()
+    }
+
+def prompt_depth(encoded: Dict, levels: int = PROMPT_DEPTH_LEVELS) -> Dict:
+    decoded = decode_depth(encoded)
+    if not decoded:
+        return {}
+
+    def nearest(side):
+        return [[price, round(quantity, 4)] for price, quantity in side[:levels]]
+
+    return {
+        "mid": encoded["mid"],
+        "bucket_size": decoded["bucket_size"],
+        "bids": nearest(decoded["bids"]),
+        "asks": nearest(decoded["asks"])
+    }
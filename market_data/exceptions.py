@@ -0,0 +1,32 @@
+from typing import Optional
+
+class BinanceAPIError(Exception):
+    retryable = False
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class BinanceRateLimitError(BinanceAPIError):
+    retryable = True
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message, status_code)
+        self.retry_after = retry_after
+
+class BinanceClientError(BinanceAPIError):
+    pass
+
+class BinanceServerError(BinanceAPIError):
+    retryable = True
+
+class BinanceTimeoutError(BinanceAPIError):
+    retryable = True
+
+class BinanceConnectionError(BinanceAPIError):
+    retryable = True
+
+class CircuitOpenError(BinanceAPIError):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Sequence, Union
+import numpy as np
+
+OHLCV_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+class OhlcvFrame:
+    __slots__ = OHLCV_COLUMNS + ("_cache",)
+
+    def __init__(self, timestamp, open, high, low, close, volume):
+        self.timestamp = np.ascontiguousarray(timestamp, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        self._cache = {}
+
+        length = len(self.timestamp)
+        for column in OHLCV_COLUMNS[1:]:
+            if len(getattr(self, column)) != length:
+                raise ValueError(f"Column '{column}' length does not match timestamp length")
+
+    @classmethod
+    def empty(cls) -> "OhlcvFrame":
+        return cls(*([np.empty(0)] * len(OHLCV_COLUMNS)))
+
+    @classmethod
+    def from_klines(cls, klines_data: Union[np.ndarray, List[List]]) -> "OhlcvFrame":
+        if not len(klines_data):
+            return cls.empty()
+
+        if isinstance(klines_data, np.ndarray):
+            raw = klines_data
+        else:
+            raw = np.array([kline[:6] for kline in klines_data], dtype=np.float64)
+        return cls(raw[:, 0], raw[:, 1], raw[:, 2], raw[:, 3], raw[:, 4], raw[:, 5])
+
+    @classmethod
+    def from_candles(cls, candles: List[Dict[str, Any]]) -> "OhlcvFrame":
+        if not candles:
+            return cls.empty()
+
+        return cls(*(
+            [candle.get(column, 0) for candle in candles]
+            for column in OHLCV_COLUMNS
+        ))
+
+    @classmethod
+    def concat(cls, frames: Sequence["OhlcvFrame"]) -> "OhlcvFrame":
+        frames = [frame for frame in frames if frame]
+        if not frames:
+            return cls.empty()
+        return cls(*(
+            np.concatenate([getattr(frame, column) for frame in frames])
+            for column in OHLCV_COLUMNS
+        ))
+
+    @classmethod
+    def coerce(cls, data: Union["OhlcvFrame", Sequence[Dict[str, Any]], None]) -> "OhlcvFrame":
+        if isinstance(data, cls):
+            return data
+        if data is None:
+            return cls.empty()
+        return cls.from_candles(list(data))
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __bool__(self) -> bool:
+        return len(self.timestamp) > 0
+
+    def __getitem__(self, key):
+        if isinstance(key, (slice, np.ndarray)):
+            return OhlcvFrame(*(getattr(self, column)[key] for column in OHLCV_COLUMNS))
+        return self.candle(key)
+
+    def candle(self, index: int) -> Dict[str, Any]:
+        return {
+            "timestamp": int(self.timestamp[index]),
+            "open": float(self.open[index]),
+            "high": float(self.high[index]),
+            "low": float(self.low[index]),
+            "close": float(self.close[index]),
+            "volume": float(self.volume[index])
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        columns = [getattr(self, column).tolist() for column in OHLCV_COLUMNS]
+        return [dict(zip(OHLCV_COLUMNS, row)) for row in zip(*columns)]
+
+    def memo(self, key, factory):
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
@@ -0,0 +1,110 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+import asyncio
+import logging
+import numpy as np
+
+logger = logging.getLogger('trading_analysis')
+
+T = TypeVar("T")
+
+class HostLatency:
+    def __init__(self, window: int = 256):
+        self.ewma: Optional[float] = None
+        self.samples = np.zeros(window)
+        self.count = 0
+
+    def record(self, seconds: float, alpha: float):
+        self.ewma = seconds if self.ewma is None else alpha * seconds + (1 - alpha) * self.ewma
+        self.samples[self.count % len(self.samples)] = seconds
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.samples[:min(self.count, len(self.samples))], q))
+
+class HedgedRouter:
+    def __init__(self, hosts: Sequence[str], percentile: float = 95.0, min_delay: float = 0.05,
+                 max_delay: float = 1.0, alpha: float = 0.2, window: int = 256, min_samples: int = 20,
+                 failure_latency: float = 10.0):
+        self.hosts: Dict[str, HostLatency] = {host.rstrip('/'): HostLatency(window) for host in hosts}
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.failure_latency = failure_latency
+
+    def ranked(self) -> List[str]:
+        # Unmeasured hosts sort first so every mirror gets probed before routing settles.
+        return sorted(self.hosts, key=lambda host: (self.hosts[host].ewma is not None, self.hosts[host].ewma or 0.0))
+
+    def hedge_delay(self, host: str) -> float:
+        latency = self.hosts[host]
+        if latency.count < self.min_samples:
+            return self.max_delay
+        return min(max(latency.percentile(self.percentile), self.min_delay), self.max_delay)
+
+    def record(self, host: str, seconds: float):
+        self.hosts[host].record(seconds, self.alpha)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            host: {
+                "ewma_ms": round(latency.ewma * 1000, 2) if latency.ewma is not None else None,
+                "p_ms": round(latency.percentile(self.percentile) * 1000, 2) if latency.count else None,
+                "samples": latency.count
+            }
+            for host, latency in self.hosts.items()
+        }
+
+    async def request(self, send: Callable[[str], Awaitable[T]], can_hedge: Optional[Callable[[], bool]] = None,
+                      label: str = "", is_failure: Optional[Callable[[T], bool]] = None) -> T:
+        loop = asyncio.get_running_loop()
+        remaining = self.ranked()
+        pending = {}
+        hedged = False
+        error = None
+        failed = []
+
+        def launch():
+            host = remaining.pop(0)
+            pending[asyncio.ensure_future(send(host))] = (host, loop.time())
+            return host
+
+        primary = launch()
+        try:
+            while pending:
+                delay = self.hedge_delay(primary) if remaining and not hedged else None
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    host, started = pending.pop(task)
+                    if task.exception() is None and not (is_failure and is_failure(task.result())):
+                        self.record(host, loop.time() - started)
+                        return task.result()
+                    # A fast error response must neither win the race nor make its host look healthy.
+                    self.record(host, self.failure_latency)
+                    if task.exception() is None:
+                        failed.append(task.result())
+                    else:
+                        error = error or task.exception()
+
+                # Hedge once when the primary is slow; fail over whenever nothing is left in flight.
+                if remaining and (not pending or not done) and (can_hedge is None or can_hedge()):
+                    if pending:
+                        hedged = True
+                        logger.info(f"Hedging {label} to {launch()} after {delay:.3f}s")
+                    else:
+                        primary = launch()
+                        logger.info(f"Failing over {label} to {primary}: {error or 'failed response'}")
+                elif not done:
+                    hedged = True
+            # Every host failed; a failed response carries more detail for the caller than a transport error.
+            if failed:
+                return failed[-1]
+            raise error
+        finally:
+            for task, (host, started) in pending.items():
+                task.cancel()
+                # A cancelled loser was at least this slow, which keeps it from winning the ranking.
+                elapsed = loop.time() - started
+                if self.hosts[host].ewma is None or elapsed > self.hosts[host].ewma:
+                    self.record(host, elapsed)
@@ -0,0 +1,225 @@
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import math
+import threading
+import numpy as np
+from .frame import OhlcvFrame
+from .intervals import interval_to_ms, now_ms
+from .volume_profile import aligned_bin_size, tick_precision, value_area, DEFAULT_BINS, VALUE_AREA_RATIO
+
+CandleLike = Union[Dict[str, Any], Sequence[float]]
+
+def _candle_values(candle: CandleLike) -> Tuple[float, float, float]:
+    if isinstance(candle, dict):
+        return float(candle['low']), float(candle['high']), float(candle['volume'])
+    low, high, volume = candle
+    return float(low), float(high), float(volume)
+
+class IncrementalVolumeProfile:
+    def __init__(self, bin_size: float, tick_size: Optional[float] = None,
+                 value_area_ratio: float = VALUE_AREA_RATIO):
+        if bin_size <= 0:
+            raise ValueError("bin_size must be positive")
+        self.bin_size = bin_size
+        self.tick_size = tick_size
+        self.value_area_ratio = value_area_ratio
+        self.candle_count = 0
+        self._origin = 0
+        self._volumes = np.zeros(0)
+        self._poc = None
+        self._value_area = None
+
+    def _bin_index(self, price: float) -> int:
+        return math.floor(round(price / self.bin_size, 9))
+
+    def _contributions(self, low: float, high: float, volume: float) -> Tuple[int, np.ndarray]:
+        first = self._bin_index(low)
+        if high <= low:
+            return first, np.array([volume])
+
+        last = max(self._bin_index(high), first)
+        edges = np.arange(first, last + 2) * self.bin_size
+        overlap = np.minimum(edges[1:], high) - np.maximum(edges[:-1], low)
+        return first, volume * np.clip(overlap, 0.0, None) / (high - low)
+
+    def _ensure_capacity(self, first: int, last: int):
+        if not len(self._volumes):
+            self._origin = first
+            self._volumes = np.zeros(last - first + 1)
+            return
+
+        end = self._origin + len(self._volumes)
+        if first >= self._origin and last < end:
+            return
+
+        padding = len(self._volumes)
+        new_origin = min(first - padding, self._origin) if first < self._origin else self._origin
+        new_end = max(last + 1 + padding, end) if last >= end else end
+        volumes = np.zeros(new_end - new_origin)
+        offset = self._origin - new_origin
+        volumes[offset:offset + len(self._volumes)] = self._volumes
+        self._origin = new_origin
+        self._volumes = volumes
+
+    def add(self, candle: CandleLike):
+        first, contributions = self._contributions(*_candle_values(candle))
+        self._ensure_capacity(first, first + len(contributions) - 1)
+
+        start = first - self._origin
+        touched = self._volumes[start:start + len(contributions)]
+        touched += contributions
+        self.candle_count += 1
+        self._value_area = None
+
+        if self._poc is not None or self.candle_count == 1:
+            best = int(np.argmax(touched))
+            candidate = first + best
+            if self._poc is None:
+                self._poc = candidate
+            else:
+                current = self._volumes[self._poc - self._origin]
+                if touched[best] > current or (touched[best] == current and candidate < self._poc):
+                    self._poc = candidate
+
+    def evict(self, candle: CandleLike):
+        first, contributions = self._contributions(*_candle_values(candle))
+        start = first - self._origin
+        if start < 0 or start + len(contributions) > len(self._volumes):
+            raise ValueError("Candle is outside of the profile range")
+
+        touched = self._volumes[start:start + len(contributions)]
+        touched -= contributions
+        touched[touched <= np.abs(contributions) * 1e-9] = 0.0
+        self.candle_count -= 1
+        self._value_area = None
+
+        if self._poc is not None and first <= self._poc < first + len(contributions):
+            self._poc = None
+
+    @property
+    def poc(self) -> float:
+        if not self.candle_count:
+            return 0.0
+        if self._poc is None:
+            self._poc = self._origin + int(np.argmax(self._volumes))
+        return self._price_level(self._poc)
+
+    def _price_level(self, index: Union[int, np.ndarray]):
+        level = (np.asarray(index) + 0.5) * self.bin_size
+        if self.tick_size:
+            level = np.round(level, tick_precision(self.tick_size) + 1)
+        return level if isinstance(index, np.ndarray) else float(level)
+
+    def _occupied(self) -> Tuple[np.ndarray, np.ndarray]:
+        occupied = np.flatnonzero(self._volumes)
+        if not len(occupied):
+            return np.zeros(0), np.zeros(0)
+
+        start, stop = occupied[0], occupied[-1] + 1
+        indexes = np.arange(self._origin + start, self._origin + stop)
+        return self._price_level(indexes), self._volumes[start:stop].copy()
+
+    def value_area(self) -> Tuple[float, float, float]:
+        if self._value_area is None:
+            price_levels, volumes = self._occupied()
+            _, vah, val = value_area(price_levels, volumes, self.value_area_ratio)
+            self._value_area = (vah, val)
+        vah, val = self._value_area
+        return self.poc, vah, val
+
+    def to_dict(self) -> Dict:
+        if not self.candle_count:
+            return {}
+
+        poc, vah, val = self.value_area()
+        price_levels, volumes = self._occupied()
+        return {
+            "poc": poc,
+            "vah": vah,
+            "val": val,
+            "bin_size": self.bin_size,
+            "price_levels": price_levels,
+            "volumes": volumes
+        }
+
+class _RollingWindow:
+    def __init__(self, interval_ms: int):
+        self.interval_ms = interval_ms
+        self.profile = None
+        self.candles = deque()
+
+    def rebuild(self, frame: OhlcvFrame, window: int, tick_size: Optional[float], bins: int):
+        frame = frame[-window:]
+        price_range = float(frame.high.max() - frame.low.min())
+        if tick_size:
+            bin_size = aligned_bin_size(price_range, tick_size, bins)
+        else:
+            bin_size = price_range / bins or max(abs(float(frame.close[-1])) * 1e-4, 1e-8)
+
+        self.profile = IncrementalVolumeProfile(bin_size, tick_size)
+        self.candles = deque()
+        self.append(frame)
+
+    def append(self, frame: OhlcvFrame):
+        for candle in zip(frame.timestamp.tolist(), frame.low.tolist(), frame.high.tolist(), frame.volume.tolist()):
+            self.profile.add(candle[1:])
+            self.candles.append(candle)
+
+    def sync(self, frame: OhlcvFrame, window: int, tick_size: Optional[float], bins: int):
+        if self.profile is None or not self.candles:
+            self.rebuild(frame, window, tick_size, bins)
+            return
+
+        last_timestamp = self.candles[-1][0]
+        if frame.timestamp[0] > last_timestamp + self.interval_ms or frame.timestamp[-1] < last_timestamp:
+            self.rebuild(frame, window, tick_size, bins)
+            return
+
+        new_candles = int(np.searchsorted(frame.timestamp, last_timestamp, side="right"))
+        self.append(frame[new_candles:])
+
+        while len(self.candles) > window:
+            self.profile.evict(self.candles.popleft()[1:])
+
+class RollingVolumeProfileRegistry:
+    def __init__(self, max_profiles: int = 512):
+        self.max_profiles = max_profiles
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_profile(self, symbol: str, interval: str, ohlcv_data: Union[OhlcvFrame, Sequence[Dict]],
+                    window: Optional[int] = None, tick_size: Optional[float] = None,
+                    bins: int = DEFAULT_BINS) -> Dict:
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        if not frame:
+            return {}
+
+        interval_ms = interval_to_ms(interval)
+        closed_count = int(np.searchsorted(frame.timestamp + interval_ms, now_ms(), side="right"))
+        closed, forming = frame[:closed_count], frame[closed_count:]
+        window = window or len(frame)
+        key = (symbol, interval, window, tick_size, bins)
+
+        with self._lock:
+            rolling = self._windows.pop(key, None) or _RollingWindow(interval_ms)
+            self._windows[key] = rolling
+            while len(self._windows) > self.max_profiles:
+                self._windows.popitem(last=False)
+
+            if not closed:
+                snapshot = _RollingWindow(interval_ms)
+                snapshot.rebuild(forming, window, tick_size, bins)
+                return snapshot.profile.to_dict()
+
+            rolling.sync(closed, max(window - len(forming), 1), tick_size, bins)
+
+            forming_candles = list(zip(forming.low.tolist(), forming.high.tolist(), forming.volume.tolist()))
+            for candle in forming_candles:
+                rolling.profile.add(candle)
+            profile = rolling.profile.to_dict()
+            for candle in forming_candles:
+                rolling.profile.evict(candle)
+
+        return profile
+
+rolling_volume_profiles = RollingVolumeProfileRegistry()
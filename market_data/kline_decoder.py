@@ -0,0 +1,77 @@
+from typing import AsyncIterator, List
+import json
+import numpy as np
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+KLINE_FIELDS = 12
+
+# Stripping the JSON structure leaves one flat comma-separated list of numbers, row after row.
+_STRUCTURE = b'[]" \t\r\n'
+_NUMERIC = b'0123456789.,-+eE'
+
+class KlineDecoder:
+    def __init__(self):
+        self._carry = b''
+        self._columns: List[np.ndarray] = []
+        self._raw: List[bytes] = []
+        self._failed = False
+        self._opened = False
+        self._depth = 0
+
+    def _parse(self, text: bytes):
+        if not text:
+            return
+        if text.translate(None, _NUMERIC):
+            raise ValueError("Unexpected kline payload")
+        values = np.fromstring(text, dtype=np.float64, sep=',')
+        if len(values) != text.count(b',') + 1:
+            raise ValueError("Unexpected kline payload")
+        self._columns.append(values)
+
+    def feed(self, chunk: bytes):
+        self._raw.append(chunk)
+        if self._failed:
+            return
+        # Brackets are stripped below, so track their balance to catch truncated bodies.
+        opened = chunk.count(b'[')
+        self._opened = self._opened or opened > 0
+        self._depth += opened - chunk.count(b']')
+        text = self._carry + chunk.translate(None, _STRUCTURE)
+        # A number can straddle two chunks, so only parse up to the last separator.
+        cut = text.rfind(b',')
+        self._carry = text[cut + 1:]
+        try:
+            self._parse(text[:max(cut, 0)])
+        except ValueError:
+            self._failed = True
+
+    def finish(self) -> np.ndarray:
+        try:
+            if self._failed or self._depth or not self._opened:
+                raise ValueError("Unexpected kline payload")
+            self._parse(self._carry)
+            values = np.concatenate(self._columns) if self._columns else np.zeros(0)
+            if len(values) % KLINE_FIELDS:
+                raise ValueError("Kline payload is not a whole number of rows")
+            klines = values.reshape(-1, KLINE_FIELDS)
+        except ValueError:
+            klines = _decode_json(b''.join(self._raw))
+        klines.flags.writeable = False
+        return klines
+
+def _decode_json(body: bytes) -> np.ndarray:
+    rows = json_loads(body)
+    if not rows:
+        return np.zeros((0, KLINE_FIELDS))
+    return np.array([row[:KLINE_FIELDS] for row in rows], dtype=np.float64)
+
+async def decode_kline_stream(chunks: AsyncIterator[bytes]) -> np.ndarray:
+    decoder = KlineDecoder()
+    async for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.finish()
@@ -0,0 +1,46 @@
+from typing import Dict, Iterable, List
+from .async_client import async_binance_client, request_policy, response_cache
+from .request_policy import CLOSED, HALF_OPEN, OPEN
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _labels(**labels) -> str:
+    pairs = ",".join(f'{name}="{str(value)}"' for name, value in labels.items())
+    return f"{{{pairs}}}"
+
+def _header(name: str, kind: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+def _histograms(histograms: Dict) -> Iterable[str]:
+    name = "binance_request_duration_seconds"
+    yield from _header(name, "histogram", "Binance REST request latency per attempt.")
+    for (endpoint, outcome), (buckets, cumulative, total) in sorted(histograms.items()):
+        for bound, count in zip(buckets.tolist(), cumulative.tolist()):
+            yield f"{name}_bucket{_labels(endpoint=endpoint, outcome=outcome, le=bound)} {count}"
+        yield f"{name}_bucket{_labels(endpoint=endpoint, outcome=outcome, le='+Inf')} {int(cumulative[-1])}"
+        yield f"{name}_sum{_labels(endpoint=endpoint, outcome=outcome)} {total:.6f}"
+        yield f"{name}_count{_labels(endpoint=endpoint, outcome=outcome)} {int(cumulative[-1])}"
+
+def render_metrics() -> str:
+    snapshot = request_policy.snapshot()
+    lines = list(_histograms(snapshot["histograms"]))
+
+    lines += _header("binance_request_retries_total", "counter", "Retried Binance REST attempts.")
+    for endpoint, count in sorted(snapshot["retries"].items()):
+        lines.append(f"binance_request_retries_total{_labels(endpoint=endpoint)} {count}")
+
+    lines += _header("binance_circuit_state", "gauge", "Circuit breaker state per endpoint.")
+    for endpoint, current in sorted(snapshot["breakers"].items()):
+        for state in (CLOSED, OPEN, HALF_OPEN):
+            lines.append(f"binance_circuit_state{_labels(endpoint=endpoint, state=state)} {int(state == current)}")
+
+    lines += _header("market_data_cache_requests_total", "counter", "Response cache lookups.")
+    for endpoint, stats in response_cache.stats().items():
+        lines.append(f"market_data_cache_requests_total{_labels(endpoint=endpoint, result='hit')} {stats['hits']}")
+        lines.append(f"market_data_cache_requests_total{_labels(endpoint=endpoint, result='miss')} {stats['misses']}")
+
+    lines += _header("binance_host_latency_ewma_seconds", "gauge", "Smoothed latency per Binance base URL.")
+    for host, stats in async_binance_client.router.stats().items():
+        if stats["ewma_ms"] is not None:
+            lines.append(f"binance_host_latency_ewma_seconds{_labels(host=host)} {stats['ewma_ms'] / 1000:.6f}")
+    return "\n".join(lines) + "\n"
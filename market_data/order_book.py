@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import logging
+import threading
+import time
+import numpy as np
+import websockets
+from sortedcontainers import SortedDict
+from django.conf import settings
+from .async_client import async_binance_client, run_background
+
+logger = logging.getLogger('trading_analysis')
+
+class OrderBookOutOfSync(Exception):
+    pass
+
+def apply_levels(side: SortedDict, levels: Sequence[Sequence]):
+    # Each level is an O(log n) insert or delete; within one event the last update for a price wins.
+    for level in levels:
+        price, quantity = float(level[0]), float(level[1])
+        if quantity:
+            side[price] = quantity
+        else:
+            side.pop(price, None)
+
+def _side_arrays(side: SortedDict, limit: Optional[int], descending: bool) -> Tuple[np.ndarray, np.ndarray]:
+    count = len(side) if limit is None else min(limit, len(side))
+    start, stop = (len(side) - count, len(side)) if descending else (0, count)
+    prices = np.array(side.keys()[start:stop], dtype=np.float64)
+    quantities = np.array(side.values()[start:stop], dtype=np.float64)
+    if descending:
+        return prices[::-1], quantities[::-1]
+    return prices, quantities
+
+class LocalOrderBook:
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.last_update_id = None
+        self.updated_at = None
+        # Both sides are kept in ascending price order, so the best bid is the last key.
+        self.bids = SortedDict()
+        self.asks = SortedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def is_synced(self) -> bool:
+        return self.last_update_id is not None
+
+    def apply_snapshot(self, snapshot: Dict):
+        bids, asks = SortedDict(), SortedDict()
+        apply_levels(bids, snapshot.get('bids', []))
+        apply_levels(asks, snapshot.get('asks', []))
+
+        with self._lock:
+            self.bids, self.asks = bids, asks
+            self.last_update_id = int(snapshot['lastUpdateId'])
+            self.updated_at = time.time()
+
+    def apply_diff(self, event: Dict) -> bool:
+        first_id, final_id = int(event['U']), int(event['u'])
+        if self.last_update_id is None:
+            raise OrderBookOutOfSync(f"{self.symbol}: diff received before snapshot")
+        if final_id <= self.last_update_id:
+            return False
+        if first_id > self.last_update_id + 1:
+            raise OrderBookOutOfSync(f"{self.symbol}: expected update {self.last_update_id + 1}, got {first_id}")
+
+        with self._lock:
+            apply_levels(self.bids, event.get('b', []))
+            apply_levels(self.asks, event.get('a', []))
+            self.last_update_id = final_id
+            self.updated_at = time.time()
+        return True
+
+    def best_bid(self) -> Optional[float]:
+        with self._lock:
+            return self.bids.peekitem(-1)[0] if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        with self._lock:
+            return self.asks.peekitem(0)[0] if self.asks else None
+
+    def depth(self, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Only the requested levels are copied out, under the lock, so readers see one consistent update.
+        with self._lock:
+            return (*_side_arrays(self.bids, limit, descending=True), *_side_arrays(self.asks, limit, descending=False))
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict:
+        bid_prices, bid_quantities, ask_prices, ask_quantities = self.depth(limit)
+        return {
+            'lastUpdateId': self.last_update_id,
+            'bids': [[str(p), str(q)] for p, q in zip(bid_prices.tolist(), bid_quantities.tolist())],
+            'asks': [[str(p), str(q)] for p, q in zip(ask_prices.tolist(), ask_quantities.tolist())]
+        }
+
+class DepthStreamManager:
+    def __init__(self, ws_url: str, snapshot_limit: int = 1000, max_symbols: int = 20, max_age: float = 5.0,
+                 idle_timeout: float = 300.0, client=None):
+        self.ws_url = ws_url.rstrip('/')
+        self.snapshot_limit = snapshot_limit
+        self.max_symbols = max_symbols
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self.client = client or async_binance_client
+        self.books: Dict[str, LocalOrderBook] = {}
+        self.read_at: Dict[str, float] = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, symbol: str):
+        self.books.pop(symbol, None)
+        self.read_at.pop(symbol, None)
+        return self._tasks.pop(symbol, None)
+
+    def _is_idle(self, symbol: str, now: Optional[float] = None) -> bool:
+        read_at = self.read_at.get(symbol)
+        return read_at is None or (time.time() if now is None else now) - read_at > self.idle_timeout
+
+    def evict_idle(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            idle = [symbol for symbol in self._tasks if self._is_idle(symbol, now)]
+            tasks = [self._drop(symbol) for symbol in idle]
+        for task in tasks:
+            task.cancel()
+        if idle:
+            logger.info(f"Order book streams evicted after {self.idle_timeout}s idle: {', '.join(idle)}")
+        return idle
+
+    def subscribe(self, symbol: str) -> bool:
+        symbol = symbol.upper()
+        if symbol not in self._tasks and len(self._tasks) >= self.max_symbols:
+            self.evict_idle()
+        with self._lock:
+            if symbol in self._tasks:
+                self.read_at[symbol] = time.time()
+                return True
+            if len(self._tasks) >= self.max_symbols:
+                return False
+            self.books[symbol] = LocalOrderBook(symbol)
+            self.read_at[symbol] = time.time()
+            self._tasks[symbol] = run_background(self._maintain(self.books[symbol]))
+        logger.info(f"Order book stream subscribed: {symbol}")
+        return True
+
+    def unsubscribe(self, symbol: str):
+        with self._lock:
+            task = self._drop(symbol.upper())
+        if task is not None:
+            task.cancel()
+
+    def get_book(self, symbol: str) -> Optional[LocalOrderBook]:
+        symbol = symbol.upper()
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is not None:
+                self.read_at[symbol] = time.time()
+        if book is None or not book.is_synced or time.time() - book.updated_at > self.max_age:
+            return None
+        return book
+
+    async def _maintain(self, book: LocalOrderBook):
+        backoff = 1.0
+        while not self._is_idle(book.symbol):
+            try:
+                await self._stream(book)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Order book stream for {book.symbol} restarting: {str(e)}")
+                book.last_update_id = None
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+        with self._lock:
+            if self.books.get(book.symbol) is book:
+                self._drop(book.symbol)
+        logger.info(f"Order book stream closed after {self.idle_timeout}s idle: {book.symbol}")
+
+    async def _snapshot(self, symbol: str) -> Dict:
+        # Each retry needs a newer lastUpdateId, so the response cache must not hand back the previous one.
+        return await self.client.get_order_book(symbol, self.snapshot_limit, fresh=True)
+
+    async def _stream(self, book: LocalOrderBook):
+        url = f"{self.ws_url}/ws/{book.symbol.lower()}@depth@100ms"
+        async with websockets.connect(url, ping_interval=20) as websocket:
+            buffered: List[Dict] = [json.loads(await websocket.recv())]
+            snapshot = await self._snapshot(book.symbol)
+            while int(snapshot['lastUpdateId']) < int(buffered[0]['U']):
+                buffered.append(json.loads(await websocket.recv()))
+                snapshot = await self._snapshot(book.symbol)
+
+            book.apply_snapshot(snapshot)
+            for event in buffered:
+                book.apply_diff(event)
+
+            async for message in websocket:
+                book.apply_diff(json.loads(message))
+                if self._is_idle(book.symbol):
+                    return
+
+depth_streams = DepthStreamManager(
+    settings.BINANCE_WS_URL,
+    max_symbols=settings.ORDER_BOOK_STREAM_MAX_SYMBOLS,
+    max_age=settings.ORDER_BOOK_STREAM_MAX_AGE,
+    idle_timeout=settings.ORDER_BOOK_STREAM_IDLE_TIMEOUT
+)
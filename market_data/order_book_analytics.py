@@ -0,0 +1,141 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .volume_profile import aligned_bin_size, tick_precision
+
+DEFAULT_IMBALANCE_BPS = (10, 25, 50, 100)
+DEFAULT_WALL_WINDOW = 21
+DEFAULT_WALL_MULTIPLE = 5.0
+DEFAULT_MAX_BUCKETS = 50
+DEFAULT_CURVE_POINTS = 50
+DEPTH_SHAPE_KEYS = ("cumulative_depth", "price_buckets")
+
+class DepthArrays(NamedTuple):
+    # Both sides are ordered best price first.
+    bid_prices: np.ndarray
+    bid_quantities: np.ndarray
+    ask_prices: np.ndarray
+    ask_quantities: np.ndarray
+
+def _side(levels: Sequence[Sequence], descending: bool) -> Tuple[np.ndarray, np.ndarray]:
+    if not len(levels):
+        return np.zeros(0), np.zeros(0)
+    raw = np.array([level[:2] for level in levels], dtype=np.float64)
+    order = np.argsort(-raw[:, 0] if descending else raw[:, 0], kind="stable")
+    return raw[order, 0], raw[order, 1]
+
+def depth_arrays(order_book_data: Dict) -> DepthArrays:
+    bid_prices, bid_quantities = _side(order_book_data.get("bids", []), descending=True)
+    ask_prices, ask_quantities = _side(order_book_data.get("asks", []), descending=False)
+    return DepthArrays(bid_prices, bid_quantities, ask_prices, ask_quantities)
+
+def mid_price(depth: DepthArrays) -> Optional[float]:
+    if not len(depth.bid_prices) or not len(depth.ask_prices):
+        return None
+    return float(depth.bid_prices[0] + depth.ask_prices[0]) / 2
+
+def cumulative_depth(prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    return np.cumsum(prices * quantities)
+
+def detect_walls(prices: np.ndarray, quantities: np.ndarray, window: int = DEFAULT_WALL_WINDOW,
+                 multiple: float = DEFAULT_WALL_MULTIPLE) -> np.ndarray:
+    notional = prices * quantities
+    if len(notional) < 3:
+        return np.zeros(0, dtype=np.int64)
+
+    window = min(window | 1, len(notional) - (1 - len(notional) % 2))
+    half = window // 2
+    padded = np.pad(notional, half, mode="edge")
+    local_median = np.median(sliding_window_view(padded, window), axis=1)
+    return np.flatnonzero(notional >= multiple * np.maximum(local_median, np.finfo(float).tiny))
+
+def imbalance(depth: DepthArrays, distances_bps: Sequence[float] = DEFAULT_IMBALANCE_BPS) -> Dict[float, float]:
+    mid = mid_price(depth)
+    if mid is None:
+        return {}
+
+    distances = np.asarray(distances_bps, dtype=np.float64) / 10_000
+    bid_cumulative = np.concatenate(([0.0], cumulative_depth(depth.bid_prices, depth.bid_quantities)))
+    ask_cumulative = np.concatenate(([0.0], cumulative_depth(depth.ask_prices, depth.ask_quantities)))
+    # Bids are descending, so search on the negated prices to keep searchsorted's ascending contract.
+    bid_counts = np.searchsorted(-depth.bid_prices, -mid * (1 - distances), side="right")
+    ask_counts = np.searchsorted(depth.ask_prices, mid * (1 + distances), side="right")
+
+    bid_notional, ask_notional = bid_cumulative[bid_counts], ask_cumulative[ask_counts]
+    total = bid_notional + ask_notional
+    ratios = np.divide(bid_notional - ask_notional, total, out=np.zeros_like(total), where=total > 0)
+    return {bps: round(float(ratio), 4) for bps, ratio in zip(distances_bps, ratios)}
+
+def bucket_levels(prices: np.ndarray, quantities: np.ndarray, bucket_size: float,
+                  round_up: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    if not len(prices):
+        return np.zeros(0), np.zeros(0)
+    scaled = np.round(prices / bucket_size, 9)
+    buckets = (np.ceil(scaled) if round_up else np.floor(scaled)).astype(np.int64)
+    keys, inverse = np.unique(buckets, return_inverse=True)
+    return keys * bucket_size, np.bincount(inverse, weights=quantities)
+
+def bucket_depth(depth: DepthArrays, mid: float, tick_size: Optional[float] = None,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    tick_size = tick_size or 10.0 ** (math.floor(math.log10(mid)) - 6)
+    span = max(mid - float(depth.bid_prices[-1]), float(depth.ask_prices[-1]) - mid)
+    bucket_size = aligned_bin_size(span, tick_size, max_buckets)
+
+    bid_prices, bid_quantities = bucket_levels(depth.bid_prices, depth.bid_quantities, bucket_size)
+    ask_prices, ask_quantities = bucket_levels(depth.ask_prices, depth.ask_quantities, bucket_size, round_up=True)
+    # Buckets come back in ascending price order; keep the ones closest to mid, best first.
+    return (bucket_size, bid_prices[::-1][:max_buckets], bid_quantities[::-1][:max_buckets],
+            ask_prices[:max_buckets], ask_quantities[:max_buckets])
+
+def depth_curve(prices: np.ndarray, quantities: np.ndarray, max_points: int = DEFAULT_CURVE_POINTS) -> List[List[float]]:
+    if not len(prices):
+        return []
+    cumulative = cumulative_depth(prices, quantities)
+    # Evenly spaced levels, always including the last so the curve ends at the side's total notional.
+    picks = np.unique(np.linspace(0, len(prices) - 1, min(max_points, len(prices))).round().astype(np.int64))
+    return np.column_stack((prices[picks], np.round(cumulative[picks], 2))).tolist()
+
+def _walls(prices: np.ndarray, quantities: np.ndarray, window: int, multiple: float) -> List[Dict]:
+    indexes = detect_walls(prices, quantities, window, multiple)
+    return [
+        {"price": float(prices[i]), "quantity": float(quantities[i]), "notional": round(float(prices[i] * quantities[i]), 2)}
+        for i in indexes
+    ]
+
+def analyze_depth(order_book_data: Dict, distances_bps: Sequence[float] = DEFAULT_IMBALANCE_BPS,
+                  wall_window: int = DEFAULT_WALL_WINDOW, wall_multiple: float = DEFAULT_WALL_MULTIPLE,
+                  tick_size: Optional[float] = None, max_buckets: int = DEFAULT_MAX_BUCKETS,
+                  curve_points: int = DEFAULT_CURVE_POINTS) -> Dict:
+    depth = depth_arrays(order_book_data)
+    mid = mid_price(depth)
+    if mid is None:
+        return {}
+
+    spread = float(depth.ask_prices[0] - depth.bid_prices[0])
+    bucket_size, bid_buckets, bid_bucket_quantities, ask_buckets, ask_bucket_quantities = bucket_depth(
+        depth, mid, tick_size, max_buckets
+    )
+    precision = tick_precision(bucket_size)
+    return {
+        "mid_price": mid,
+        "spread": spread,
+        "spread_bps": round(spread / mid * 10_000, 4),
+        "bid_notional": round(float(np.dot(depth.bid_prices, depth.bid_quantities)), 2),
+        "ask_notional": round(float(np.dot(depth.ask_prices, depth.ask_quantities)), 2),
+        "imbalance": imbalance(depth, distances_bps),
+        "bid_walls": _walls(depth.bid_prices, depth.bid_quantities, wall_window, wall_multiple),
+        "ask_walls": _walls(depth.ask_prices, depth.ask_quantities, wall_window, wall_multiple),
+        "cumulative_depth": {
+            "bids": depth_curve(depth.bid_prices, depth.bid_quantities, curve_points),
+            "asks": depth_curve(depth.ask_prices, depth.ask_quantities, curve_points)
+        },
+        "price_buckets": {
+            "bucket_size": bucket_size,
+            "bids": np.column_stack((np.round(bid_buckets, precision), bid_bucket_quantities)).tolist(),
+            "asks": np.column_stack((np.round(ask_buckets, precision), ask_bucket_quantities)).tolist()
+        }
+    }
+
+def liquidity_summary(liquidity: Dict) -> Dict:
+    return {key: value for key, value in liquidity.items() if key not in DEPTH_SHAPE_KEYS}
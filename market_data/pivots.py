@@ -0,0 +1,121 @@
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .frame import OhlcvFrame
+
+class PivotMasks(NamedTuple):
+    highs: np.ndarray
+    lows: np.ndarray
+
+def rolling_pivot_mask(values: np.ndarray, window: int, kind: str, strict: bool = False) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    size = len(values)
+    mask = np.zeros(size, dtype=bool)
+    if window < 1 or size < 2 * window + 1:
+        return mask
+
+    reducer = np.max if kind == "high" else np.min
+    sides = reducer(sliding_window_view(values, window), axis=1)
+    left = sides[:size - 2 * window]
+    right = sides[window + 1:]
+    centre = values[window:size - window]
+
+    if kind == "high":
+        neighbours = np.maximum(left, right)
+        mask[window:size - window] = centre > neighbours if strict else centre >= neighbours
+    else:
+        neighbours = np.minimum(left, right)
+        mask[window:size - window] = centre < neighbours if strict else centre <= neighbours
+    return mask
+
+def pivot_masks(highs: np.ndarray, lows: np.ndarray, window: int, strict: bool = False) -> PivotMasks:
+    return PivotMasks(
+        rolling_pivot_mask(highs, window, "high", strict),
+        rolling_pivot_mask(lows, window, "low", strict)
+    )
+
+def detect_pivots(frame: OhlcvFrame, window: int = 5, strict: bool = False) -> PivotMasks:
+    return frame.memo(
+        ("pivots", window, strict),
+        lambda: pivot_masks(frame.high, frame.low, window, strict)
+    )
+
+class _RollingExtreme:
+    def __init__(self, width: int, kind: str):
+        self.width = width
+        self.kind = kind
+        self._window = deque()
+
+    def push(self, index: int, value: float) -> float:
+        window = self._window
+        if self.kind == "high":
+            while window and window[-1][1] <= value:
+                window.pop()
+        else:
+            while window and window[-1][1] >= value:
+                window.pop()
+        window.append((index, value))
+        while window[0][0] <= index - self.width:
+            window.popleft()
+        return window[0][1]
+
+class StreamingPivotDetector:
+    def __init__(self, window: int = 5, strict: bool = False, exclusive: bool = False, start_index: int = 0):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.strict = strict
+        self.exclusive = exclusive
+        self.index = start_index - 1
+        self._bars = deque(maxlen=2 * window + 1)
+        self._high_extreme = _RollingExtreme(window, "high")
+        self._low_extreme = _RollingExtreme(window, "low")
+        self._high_history = deque(maxlen=window + 2)
+        self._low_history = deque(maxlen=window + 2)
+
+    def update(self, candle: Union[Dict[str, Any], Sequence[float]]) -> List[Dict]:
+        if isinstance(candle, dict):
+            high, low, timestamp = float(candle['high']), float(candle['low']), candle.get('timestamp')
+        else:
+            high, low = float(candle[0]), float(candle[1])
+            timestamp = None
+
+        self.index += 1
+        self._bars.append((high, low, timestamp))
+        self._high_history.append(self._high_extreme.push(self.index, high))
+        self._low_history.append(self._low_extreme.push(self.index, low))
+
+        if len(self._bars) < self._bars.maxlen:
+            return []
+
+        centre_high, centre_low, centre_timestamp = self._bars[self.window]
+        neighbour_high = max(self._high_history[0], self._high_history[-1])
+        neighbour_low = min(self._low_history[0], self._low_history[-1])
+
+        if self.strict:
+            is_high, is_low = centre_high > neighbour_high, centre_low < neighbour_low
+        else:
+            is_high, is_low = centre_high >= neighbour_high, centre_low <= neighbour_low
+
+        events = []
+        centre_index = self.index - self.window
+        if is_high:
+            events.append(self._event(centre_index, centre_high, "high", centre_timestamp))
+        if is_low and not (self.exclusive and is_high):
+            events.append(self._event(centre_index, centre_low, "low", centre_timestamp))
+        return events
+
+    def update_many(self, ohlcv_data: Union[OhlcvFrame, Sequence[Dict[str, Any]]]) -> List[Dict]:
+        frame = OhlcvFrame.coerce(ohlcv_data)
+        events = []
+        for high, low, timestamp in zip(frame.high.tolist(), frame.low.tolist(), frame.timestamp.tolist()):
+            events.extend(self.update({"high": high, "low": low, "timestamp": timestamp}))
+        return events
+
+    @staticmethod
+    def _event(index: int, price: float, kind: str, timestamp: Optional[int]) -> Dict:
+        event = {"index": index, "price": price, "type": kind}
+        if timestamp is not None:
+            event["timestamp"] = timestamp
+        return event
@@ -0,0 +1,110 @@
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+import asyncio
+import fcntl
+import logging
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger('trading_analysis')
+
+# (tokens, updated_at, blocked_until)
+State = Tuple[float, float, float]
+
+DEFAULT_WEIGHT = 1
+ENDPOINT_WEIGHTS = {
+    "/api/v3/klines": 2,
+    "/api/v3/ticker/24hr": 2,
+    "/api/v3/exchangeInfo": 20,
+}
+DEPTH_WEIGHTS = ((100, 5), (500, 25), (1000, 50), (5000, 250))
+
+def endpoint_weight(endpoint: str, params: Optional[Dict] = None) -> int:
+    params = params or {}
+    if endpoint == "/api/v3/depth":
+        limit = int(params.get("limit", 100))
+        for max_limit, weight in DEPTH_WEIGHTS:
+            if limit <= max_limit:
+                return weight
+        return DEPTH_WEIGHTS[-1][1]
+    if endpoint == "/api/v3/ticker/24hr" and "symbol" not in params:
+        return 80
+    return ENDPOINT_WEIGHTS.get(endpoint, DEFAULT_WEIGHT)
+
+class MemoryBackend:
+    def __init__(self):
+        self._state = None
+        self._lock = threading.Lock()
+
+    def update(self, transition: Callable[[Optional[State]], Tuple[State, float]]) -> float:
+        with self._lock:
+            self._state, result = transition(self._state)
+            return result
+
+class FileBackend:
+    STATE = struct.Struct("<ddd")
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def update(self, transition: Callable[[Optional[State]], Tuple[State, float]]) -> float:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, self.STATE.size, 0)
+            state, result = transition(self.STATE.unpack(raw) if len(raw) == self.STATE.size else None)
+            os.pwrite(fd, self.STATE.pack(*state), 0)
+            return result
+        finally:
+            os.close(fd)
+
+class WeightRateLimiter:
+    def __init__(self, capacity: int, window_seconds: float = 60.0, backend=None):
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / window_seconds
+        self.backend = backend or MemoryBackend()
+
+    def _refill(self, state: Optional[State], now: float) -> Tuple[float, float]:
+        if state is None:
+            return self.capacity, 0.0
+        tokens, updated_at, blocked_until = state
+        return min(self.capacity, tokens + max(now - updated_at, 0.0) * self.refill_rate), blocked_until
+
+    def reserve(self, weight: int) -> float:
+        def transition(state):
+            now = time.time()
+            tokens, blocked_until = self._refill(state, now)
+            tokens -= weight
+            wait = max(blocked_until - now, -tokens / self.refill_rate, 0.0)
+            return (tokens, now, blocked_until), wait
+        return self.backend.update(transition)
+
+    def try_reserve(self, weight: int) -> bool:
+        def transition(state):
+            now = time.time()
+            tokens, blocked_until = self._refill(state, now)
+            if blocked_until > now or tokens < weight:
+                return (tokens, now, blocked_until), False
+            return (tokens - weight, now, blocked_until), True
+        return self.backend.update(transition)
+
+    def sync(self, used_weight: Optional[int] = None, retry_after: Optional[float] = None):
+        def transition(state):
+            now = time.time()
+            tokens, blocked_until = self._refill(state, now)
+            if used_weight is not None:
+                tokens = min(tokens, self.capacity - used_weight)
+            if retry_after:
+                blocked_until = max(blocked_until, now + retry_after)
+            return (tokens, now, blocked_until), 0.0
+        self.backend.update(transition)
+
+    async def acquire(self, weight: int):
+        wait = self.reserve(weight)
+        if wait > 0:
+            logger.info(f"Binance weight budget exhausted, queueing request for {wait:.2f}s")
+            await asyncio.sleep(wait)
+
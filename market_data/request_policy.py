@@ -0,0 +1,154 @@
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple, TypeVar
+from collections import defaultdict
+import asyncio
+import logging
+import random
+import threading
+import time
+import numpy as np
+from .exceptions import BinanceAPIError, BinanceRateLimitError, CircuitOpenError
+
+logger = logging.getLogger('trading_analysis')
+
+T = TypeVar("T")
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.2, max_delay: float = 5.0, seed: Optional[int] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = random.Random(seed)
+
+    def delay(self, attempt: int, error: BinanceAPIError) -> Optional[float]:
+        if not error.retryable or attempt >= self.max_retries:
+            return None
+        if isinstance(error, BinanceRateLimitError) and error.retry_after:
+            # Never retry before the exchange allows it; waits longer than max_delay fail fast instead.
+            return error.retry_after if error.retry_after <= self.max_delay else None
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before(self, name: str):
+        if self.state == CLOSED:
+            return
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == OPEN and remaining <= 0:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        raise CircuitOpenError(f"Circuit open for {name}, failing fast", max(remaining, 0.0) or None)
+
+    def success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release(self):
+        self._trial_in_flight = False
+
+    def failure(self, name: str):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit opened for {name} after {self.failures} failures")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+class LatencyHistogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = np.asarray(buckets, dtype=np.float64)
+        self.counts = np.zeros(len(self.buckets) + 1, dtype=np.int64)
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[np.searchsorted(self.buckets, seconds, side="left")] += 1
+        self.sum += seconds
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def cumulative(self) -> np.ndarray:
+        return np.cumsum(self.counts)
+
+class RequestPolicy:
+    def __init__(self, retry: Optional[RetryPolicy] = None, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.buckets = buckets
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.retries = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[endpoint]
+
+    def observe(self, endpoint: str, outcome: str, seconds: float):
+        with self._lock:
+            key = (endpoint, outcome)
+            if key not in self.histograms:
+                self.histograms[key] = LatencyHistogram(self.buckets)
+            self.histograms[key].observe(seconds)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "histograms": {key: (h.buckets, h.cumulative(), h.sum) for key, h in self.histograms.items()},
+                "breakers": {endpoint: breaker.state for endpoint, breaker in self.breakers.items()},
+                "retries": dict(self.retries)
+            }
+
+    async def call(self, endpoint: str, send: Callable[[], Awaitable[T]],
+                   acquire: Optional[Callable[[], Awaitable]] = None) -> T:
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            breaker.before(endpoint)
+            started = time.perf_counter()
+            try:
+                if acquire is not None:
+                    await acquire()
+                    started = time.perf_counter()
+                result = await send()
+            except BinanceAPIError as e:
+                self.observe(endpoint, type(e).__name__, time.perf_counter() - started)
+                # Rate limits and client errors say nothing about upstream health, so the streak is left as is.
+                if e.retryable and not isinstance(e, BinanceRateLimitError):
+                    breaker.failure(endpoint)
+                else:
+                    breaker.release()
+                delay = self.retry.delay(attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                self.retries[endpoint] += 1
+                logger.warning(f"Retrying {endpoint} in {delay:.2f}s (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(delay)
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                self.observe(endpoint, "ok", time.perf_counter() - started)
+                breaker.success()
+                return result
@@ -0,0 +1,56 @@
+import logging
+import numpy as np
+from .frame import OhlcvFrame
+from .intervals import DAY_MS, interval_to_ms
+
+logger = logging.getLogger('trading_analysis')
+
+# The epoch fell on a Thursday; Binance weekly candles open on Monday 00:00 UTC.
+INTERVAL_ANCHOR_MS = {"1w": 4 * DAY_MS}
+# Binance anchors 3d candles to its own listing calendar, which cannot be derived from UTC alone.
+UNALIGNED_INTERVALS = {"3d"}
+
+def can_resample(source_interval: str, target_interval: str) -> bool:
+    if target_interval in UNALIGNED_INTERVALS:
+        return False
+    source_ms, target_ms = interval_to_ms(source_interval), interval_to_ms(target_interval)
+    return target_ms > source_ms and target_ms % source_ms == 0
+
+def bucket_starts(timestamps: np.ndarray, interval: str) -> np.ndarray:
+    anchor = INTERVAL_ANCHOR_MS.get(interval, 0)
+    return timestamps - (timestamps - anchor) % interval_to_ms(interval)
+
+def missing_candles(timestamps: np.ndarray, interval: str) -> int:
+    interval_ms = interval_to_ms(interval)
+    deltas = np.diff(timestamps)
+    return int((deltas[deltas > interval_ms] // interval_ms - 1).sum())
+
+def resample(frame: OhlcvFrame, source_interval: str, target_interval: str) -> OhlcvFrame:
+    if not can_resample(source_interval, target_interval):
+        raise ValueError(f"Cannot resample {source_interval} candles into {target_interval}")
+    if not frame:
+        return OhlcvFrame.empty()
+
+    source_ms = interval_to_ms(source_interval)
+    starts = bucket_starts(frame.timestamp, target_interval)
+    first_rows = np.flatnonzero(np.concatenate(([True], starts[1:] != starts[:-1])))
+    last_rows = np.append(first_rows[1:] - 1, len(frame) - 1)
+
+    # A bucket is only trustworthy when its base candles run unbroken from the bucket open; only the
+    # last bucket may stop early, because it is still forming.
+    expected = (frame.timestamp[last_rows] - starts[first_rows]) // source_ms + 1
+    intact = (frame.timestamp[first_rows] == starts[first_rows]) & (last_rows - first_rows + 1 == expected)
+    intact[:-1] &= expected[:-1] == interval_to_ms(target_interval) // source_ms
+
+    resampled = OhlcvFrame(
+        starts[first_rows],
+        frame.open[first_rows],
+        np.maximum.reduceat(frame.high, first_rows),
+        np.minimum.reduceat(frame.low, first_rows),
+        frame.close[last_rows],
+        np.add.reduceat(frame.volume, first_rows)
+    )
+    # History that starts mid-bucket would under-report the first candle; gaps corrupt the ones they hit.
+    if not intact[1:].all():
+        logger.warning(f"Resample {source_interval}->{target_interval} dropped {int((~intact[1:]).sum())} gapped buckets")
+    return resampled[intact]
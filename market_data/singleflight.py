@@ -0,0 +1,61 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+import asyncio
+import threading
+
+T = TypeVar("T")
+
+def request_key(endpoint: str, params: Optional[Dict] = None) -> Hashable:
+    return endpoint, tuple(sorted((params or {}).items()))
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls: Dict[Any, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        call_key = (asyncio.get_running_loop(), key)
+        future = self._calls.get(call_key)
+        if future is None:
+            future = self._calls[call_key] = asyncio.ensure_future(factory())
+
+            def forget(done: asyncio.Future):
+                if self._calls.get(call_key) is done:
+                    del self._calls[call_key]
+            future.add_done_callback(forget)
+
+        return await asyncio.shield(future)
@@ -0,0 +1,338 @@
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+import zlib
+import numpy as np
+import websockets
+from .intervals import HOUR_MS, interval_to_ms, now_ms
+
+logger = logging.getLogger('trading_analysis')
+
+DEFAULT_SYMBOLS = ("BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT", "ETHBTC")
+QUOTE_ASSETS = ("USDT", "BTC")
+
+def _base_price(symbol: str) -> float:
+    return 10.0 ** (zlib.crc32(symbol.encode()) % 5) * 1.7
+
+def _tick_size(price: float) -> float:
+    return 10.0 ** (int(np.floor(np.log10(price))) - 4)
+
+def _split_symbol(symbol: str) -> Tuple[str, str]:
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote):
+            return symbol[:-len(quote)], quote
+    return symbol[:-3], symbol[-3:]
+
+def _fmt(value: float) -> str:
+    return f"{value:.8f}"
+
+def synthetic_klines(symbol: str, interval: str, limit: int = 500, start_time: Optional[int] = None,
+                     end_time: Optional[int] = None, now: Optional[int] = None) -> List[List]:
+    interval_ms = interval_to_ms(interval)
+    now = now_ms() if now is None else now
+    last_open = min(now, end_time if end_time is not None else now)
+    last_open -= last_open % interval_ms
+    if start_time is not None:
+        first_open = start_time + (-start_time) % interval_ms
+        opens = np.arange(first_open, min(first_open + limit * interval_ms, last_open + 1), interval_ms, dtype=np.int64)
+    else:
+        opens = np.arange(last_open - (limit - 1) * interval_ms, last_open + 1, interval_ms, dtype=np.int64)
+
+    base = _base_price(symbol)
+    klines = []
+    for open_time in opens.tolist():
+        # Every candle is a pure function of (symbol, open time), so overlapping requests agree.
+        rng = np.random.default_rng([zlib.crc32(symbol.encode()), open_time // HOUR_MS, interval_ms])
+        level = base * (1 + 0.05 * np.sin(open_time / (90 * 24 * HOUR_MS) * 2 * np.pi))
+        open_price, close_price = level * (1 + rng.normal(0, 0.004, 2))
+        high = max(open_price, close_price) * (1 + abs(rng.normal(0, 0.002)))
+        low = min(open_price, close_price) * (1 - abs(rng.normal(0, 0.002)))
+        volume = rng.gamma(2.0, 50.0)
+        klines.append([
+            open_time, _fmt(open_price), _fmt(high), _fmt(low), _fmt(close_price), _fmt(volume),
+            open_time + interval_ms - 1, _fmt(volume * close_price), int(rng.integers(10, 1000)),
+            _fmt(volume / 2), _fmt(volume * close_price / 2), "0"
+        ])
+    return klines
+
+def synthetic_depth(symbol: str, limit: int = 100) -> Dict:
+    price = float(synthetic_klines(symbol, "1m", 1)[-1][4])
+    tick = _tick_size(price)
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    offsets = np.arange(1, limit + 1) * tick
+    bid_quantities, ask_quantities = rng.gamma(1.5, 2.0, (2, limit))
+    return {
+        "lastUpdateId": now_ms(),
+        "bids": [[_fmt(price - o), _fmt(q)] for o, q in zip(offsets.tolist(), bid_quantities.tolist())],
+        "asks": [[_fmt(price + o), _fmt(q)] for o, q in zip(offsets.tolist(), ask_quantities.tolist())]
+    }
+
+class SyntheticDepthFeed:
+    def __init__(self, levels: int = 200, seed: Optional[int] = None):
+        self.levels = levels
+        self.books: Dict[str, Dict] = {}
+        self._gaps: Set[str] = set()
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def _book(self, symbol: str) -> Dict:
+        if symbol not in self.books:
+            depth = synthetic_depth(symbol, self.levels)
+            self.books[symbol] = {
+                "last_update_id": 1000,
+                "tick": _tick_size(float(depth["bids"][0][0])),
+                "bids": {float(p): float(q) for p, q in depth["bids"]},
+                "asks": {float(p): float(q) for p, q in depth["asks"]}
+            }
+        return self.books[symbol]
+
+    def snapshot(self, symbol: str, limit: int = 100) -> Dict:
+        with self._lock:
+            book = self._book(symbol)
+            bids = sorted(book["bids"].items(), reverse=True)[:limit]
+            asks = sorted(book["asks"].items())[:limit]
+            return {
+                "lastUpdateId": book["last_update_id"],
+                "bids": [[_fmt(p), _fmt(q)] for p, q in bids],
+                "asks": [[_fmt(p), _fmt(q)] for p, q in asks]
+            }
+
+    def gap(self, symbol: str):
+        with self._lock:
+            self._gaps.add(symbol)
+
+    def _advance(self, symbol: str) -> Dict:
+        book = self._book(symbol)
+        first_id = book["last_update_id"] + 1
+        best_bid, best_ask = max(book["bids"]), min(book["asks"])
+        changes = {"b": [], "a": []}
+        for _ in range(int(self._rng.integers(1, 6))):
+            side = "b" if self._rng.random() < 0.5 else "a"
+            offset = int(self._rng.integers(0, self.levels)) * book["tick"]
+            price = float(_fmt(best_bid - offset if side == "b" else best_ask + offset))
+            quantity = 0.0 if self._rng.random() < 0.3 else round(float(self._rng.gamma(1.5, 2.0)), 6)
+            levels = book["bids" if side == "b" else "asks"]
+            if quantity:
+                levels[price] = quantity
+            elif len(levels) > 1:
+                levels.pop(price, None)
+            else:
+                continue
+            changes[side].append([_fmt(price), _fmt(quantity)])
+        # Binance may fold several update ids into one event.
+        book["last_update_id"] = first_id + int(self._rng.integers(0, 3))
+        return {"e": "depthUpdate", "E": now_ms(), "s": symbol, "U": first_id, "u": book["last_update_id"],
+                "b": changes["b"], "a": changes["a"]}
+
+    def next_event(self, symbol: str) -> Dict:
+        with self._lock:
+            if symbol in self._gaps:
+                # The skipped event still changes the book, so subscribers must resync to recover.
+                self._gaps.discard(symbol)
+                self._advance(symbol)
+            return self._advance(symbol)
+
+class DepthStandInServer:
+    def __init__(self, feed: Optional[SyntheticDepthFeed] = None, interval: float = 0.05):
+        self.feed = feed or SyntheticDepthFeed()
+        self.interval = interval
+        self.url = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._paused = None
+        self._loop = None
+        self._server = None
+
+    async def _handler(self, websocket):
+        stream = websocket.path.rsplit("/", 1)[-1]
+        symbol, _, channel = stream.partition("@")
+        if not channel.startswith("depth"):
+            await websocket.close(code=1008, reason=f"Unknown stream {stream}")
+            return
+        queue = asyncio.Queue()
+        self._subscribers[symbol.upper()].add(queue)
+        try:
+            while True:
+                await websocket.send(json.dumps(await queue.get(), separators=(",", ":")))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._subscribers[symbol.upper()].discard(queue)
+
+    async def _produce(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._paused.is_set():
+                continue
+            for symbol, queues in list(self._subscribers.items()):
+                if queues:
+                    event = self.feed.next_event(symbol)
+                    for queue in list(queues):
+                        queue.put_nowait(event)
+
+    def pause(self):
+        self._loop.call_soon_threadsafe(self._paused.set)
+
+    def resume(self):
+        self._loop.call_soon_threadsafe(self._paused.clear)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        ready = threading.Event()
+
+        async def serve():
+            self._paused = asyncio.Event()
+            self._server = await websockets.serve(self._handler, host, port)
+            self.url = f"ws://{host}:{self._server.sockets[0].getsockname()[1]}"
+            producer = asyncio.ensure_future(self._produce())
+            ready.set()
+            await self._server.wait_closed()
+            producer.cancel()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(serve())
+            self._loop.close()
+
+        threading.Thread(target=run, name="standin-depth-stream", daemon=True).start()
+        ready.wait()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+def synthetic_ticker(symbol: str) -> Dict:
+    klines = synthetic_klines(symbol, "1h", 24)
+    open_price, last_price = float(klines[0][1]), float(klines[-1][4])
+    return {
+        "symbol": symbol,
+        "priceChange": _fmt(last_price - open_price),
+        "priceChangePercent": f"{(last_price / open_price - 1) * 100:.3f}",
+        "openPrice": _fmt(open_price),
+        "lastPrice": _fmt(last_price),
+        "highPrice": _fmt(max(float(k[2]) for k in klines)),
+        "lowPrice": _fmt(min(float(k[3]) for k in klines)),
+        "volume": _fmt(sum(float(k[5]) for k in klines)),
+        "quoteVolume": _fmt(sum(float(k[7]) for k in klines)),
+        "openTime": klines[0][0],
+        "closeTime": klines[-1][6]
+    }
+
+def synthetic_exchange_info(symbols=DEFAULT_SYMBOLS) -> Dict:
+    entries = []
+    for symbol in symbols:
+        base_asset, quote_asset = _split_symbol(symbol)
+        entries.append({
+            "symbol": symbol,
+            "status": "TRADING",
+            "baseAsset": base_asset,
+            "quoteAsset": quote_asset,
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": "0.00000100", "maxPrice": "1000000.00000000",
+                 "tickSize": _fmt(_tick_size(_base_price(symbol)))},
+                {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"}
+            ]
+        })
+    return {"timezone": "UTC", "serverTime": now_ms(), "symbols": entries}
+
+def synthetic_message(body: Dict) -> Dict:
+    prompt = " ".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for message in body.get("messages", [])
+        for block in ([message["content"]] if isinstance(message["content"], str) else message["content"])
+    )
+    text = ("Price is holding above the recent value area; a break of the nearest resistance with volume "
+            "confirms continuation, while a loss of support opens a pullback toward the point of control.")
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "stand-in"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": len(prompt.split()), "output_tokens": len(text.split())}
+    }
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    symbols = DEFAULT_SYMBOLS
+    depth_feed: Optional[SyntheticDepthFeed] = None
+    latency = 0.0
+    fail_status: Optional[int] = None
+
+    def _send_json(self, status: int, payload, headers: Optional[Dict] = None):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Hedged clients hang up on the slower host; that is expected here.
+            self.close_connection = True
+
+    def _error(self, status: int, code: int, message: str):
+        self._send_json(status, {"code": code, "msg": message})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        symbol = params.get("symbol", "").upper()
+        weight = {"X-MBX-USED-WEIGHT-1M": "1"}
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_status:
+            return self._error(self.fail_status, -1000, "Stand-in failure")
+        try:
+            if url.path == "/api/v3/klines":
+                payload = synthetic_klines(
+                    symbol, params.get("interval", "1h"), min(int(params.get("limit", 500)), 1000),
+                    int(params["startTime"]) if "startTime" in params else None,
+                    int(params["endTime"]) if "endTime" in params else None
+                )
+            elif url.path == "/api/v3/depth":
+                limit = min(int(params.get("limit", 100)), 5000)
+                payload = self.depth_feed.snapshot(symbol, limit) if self.depth_feed else synthetic_depth(symbol, limit)
+            elif url.path == "/api/v3/ticker/24hr":
+                payload = synthetic_ticker(symbol) if symbol else [synthetic_ticker(s) for s in self.symbols]
+            elif url.path == "/api/v3/exchangeInfo":
+                payload = synthetic_exchange_info([symbol] if symbol else self.symbols)
+            else:
+                return self._error(404, -1, f"Unknown endpoint {url.path}")
+        except ValueError as e:
+            return self._error(400, -1100, str(e))
+        self._send_json(200, payload, weight)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/v1/messages":
+            return self._error(404, -1, f"Unknown endpoint {url.path}")
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self._send_json(200, synthetic_message(body), {"request-id": f"req_{uuid.uuid4().hex[:24]}"})
+
+    def log_message(self, format, *args):
+        logger.debug(f"Stand-in server: {format % args}")
+
+def standin_handler(depth_feed: Optional[SyntheticDepthFeed] = None, latency: float = 0.0,
+                    fail_status: Optional[int] = None):
+    # Each server gets its own handler class, so depth feeds and injected faults never leak between servers.
+    return type("StandInHandler", (StandInHandler,), {
+        "depth_feed": depth_feed, "latency": latency, "fail_status": fail_status
+    })
+
+def start_standin_server(host: str = "127.0.0.1", port: int = 0, depth_feed: Optional[SyntheticDepthFeed] = None,
+                         latency: float = 0.0, fail_status: Optional[int] = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), standin_handler(depth_feed, latency, fail_status))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server
@@ -0,0 +1,498 @@
+from unittest import mock
+import asyncio
+import json
+import tempfile
+import time
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from . import async_client
+from .async_client import AsyncBinanceClient, run_sync
+from .cache import MISSING, LRUCacheBackend, ResponseCache, ResponseCachePolicy
+from .candle_store import CandleStore
+from .depth_codec import DEPTH_CODEC_VERSION, decode_depth, encode_depth, prompt_depth
+from .frame import OHLCV_COLUMNS, OhlcvFrame
+from .hedging import HedgedRouter
+from .incremental_profile import IncrementalVolumeProfile
+from .intervals import interval_to_ms, now_ms
+from .kline_decoder import KLINE_FIELDS, decode_kline_stream
+from .order_book import DepthStreamManager, LocalOrderBook, OrderBookOutOfSync
+from .order_book_analytics import DEPTH_SHAPE_KEYS, analyze_depth, bucket_depth, depth_arrays, detect_walls, imbalance, liquidity_summary
+from .pivots import StreamingPivotDetector, pivot_masks
+from .standin_server import DepthStandInServer, SyntheticDepthFeed, start_standin_server, synthetic_klines
+from .volume_profile import aligned_bin_edges, overlap_histogram, tick_precision
+
+def wait_for(condition, timeout: float = 10.0, interval: float = 0.02) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return False
+
+def levels(side):
+    return [(float(price), float(quantity)) for price, quantity in side]
+
+def assertFramesEqual(test, actual: OhlcvFrame, expected: OhlcvFrame):
+    for column in OHLCV_COLUMNS:
+        np.testing.assert_array_equal(getattr(actual, column), getattr(expected, column), err_msg=column)
+
+def depth_book(mid: float, tick: float, levels: int = 200, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    steps = np.arange(1, levels + 1)
+    precision = tick_precision(tick)
+    return {
+        "bids": [[f"{price:.{precision}f}", quantity] for price, quantity in zip(mid - steps * tick, rng.uniform(1, 2, levels))],
+        "asks": [[f"{price:.{precision}f}", quantity] for price, quantity in zip(mid + steps * tick, rng.uniform(1, 2, levels))]
+    }
+
+def random_frame(seed: int, length: int = 300, price: float = 100.0, interval_ms: int = 60_000,
+                 start: int = 1_600_000_000_000) -> OhlcvFrame:
+    rng = np.random.default_rng(seed)
+    close = np.round(price * np.exp(np.cumsum(rng.normal(0, 0.01, length))), 2)
+    open_ = np.round(np.concatenate(([price], close[:-1])), 2)
+    high = np.round(np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, length)), 2)
+    low = np.round(np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, length)), 2)
+    flat = rng.random(length) < 0.05
+    open_[flat] = low[flat] = high[flat] = close[flat]
+    timestamp = start + np.arange(length, dtype=np.int64) * interval_ms
+    return OhlcvFrame(timestamp, open_, high, low, close, rng.uniform(1, 100, length))
+
+class LocalOrderBookTests(SimpleTestCase):
+    def setUp(self):
+        self.book = LocalOrderBook("BTCUSDT")
+        self.book.apply_snapshot({
+            "lastUpdateId": 100,
+            "bids": [["99.0", "1.0"], ["98.0", "2.0"]],
+            "asks": [["101.0", "1.5"], ["102.0", "2.5"]]
+        })
+
+    def test_diff_before_snapshot_is_rejected(self):
+        with self.assertRaises(OrderBookOutOfSync):
+            LocalOrderBook("BTCUSDT").apply_diff({"U": 1, "u": 2, "b": [], "a": []})
+
+    def test_stale_diff_is_skipped(self):
+        self.assertFalse(self.book.apply_diff({"U": 90, "u": 100, "b": [["99.0", "0"]], "a": []}))
+        self.assertEqual(self.book.best_bid(), 99.0)
+
+    def test_diff_straddling_snapshot_is_applied(self):
+        self.assertTrue(self.book.apply_diff({"U": 95, "u": 105, "b": [["99.5", "3.0"]], "a": [["101.0", "0"]]}))
+        self.assertEqual(self.book.last_update_id, 105)
+        self.assertEqual(self.book.best_bid(), 99.5)
+        self.assertEqual(self.book.best_ask(), 102.0)
+
+    def test_gap_raises(self):
+        self.book.apply_diff({"U": 101, "u": 102, "b": [], "a": []})
+        with self.assertRaises(OrderBookOutOfSync):
+            self.book.apply_diff({"U": 104, "u": 106, "b": [], "a": []})
+
+    def test_last_update_for_a_price_wins(self):
+        self.book.apply_diff({"U": 101, "u": 101, "b": [["98.0", "5.0"], ["98.0", "0"], ["97.0", "4.0"]], "a": []})
+        self.assertEqual(levels(self.book.to_dict()["bids"]), [(99.0, 1.0), (97.0, 4.0)])
+
+class DepthStreamTests(SimpleTestCase):
+    symbol = "BTCUSDT"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.feed = SyntheticDepthFeed(seed=7)
+        cls.stream_server = DepthStandInServer(cls.feed, interval=0.01)
+        cls.ws_url = cls.stream_server.start()
+        cls.http_server = start_standin_server(depth_feed=cls.feed)
+        cls.binance_client = AsyncBinanceClient(base_url=f"http://127.0.0.1:{cls.http_server.server_address[1]}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stream_server.stop()
+        cls.http_server.shutdown()
+        cls.http_server.server_close()
+        super().tearDownClass()
+
+    def manager(self, **options) -> DepthStreamManager:
+        manager = DepthStreamManager(self.ws_url, client=self.binance_client, **{"max_age": 60.0, **options})
+        self.addCleanup(lambda: [manager.unsubscribe(symbol) for symbol in list(manager.books)])
+        return manager
+
+    def assertBookMatchesFeed(self, manager: DepthStreamManager):
+        self.stream_server.pause()
+        try:
+            book = manager.books[self.symbol]
+            self.assertTrue(wait_for(
+                lambda: book.last_update_id == self.feed.books[self.symbol]["last_update_id"]
+            ))
+            expected = self.feed.snapshot(self.symbol, limit=1000)
+            actual = book.to_dict()
+            self.assertEqual(levels(actual["bids"]), levels(expected["bids"]))
+            self.assertEqual(levels(actual["asks"]), levels(expected["asks"]))
+        finally:
+            self.stream_server.resume()
+
+    def test_stream_follows_update_ids(self):
+        manager = self.manager()
+        self.assertTrue(manager.subscribe(self.symbol))
+        self.assertTrue(wait_for(lambda: manager.get_book(self.symbol) is not None))
+        first_id = manager.books[self.symbol].last_update_id
+        self.assertTrue(wait_for(lambda: manager.books[self.symbol].last_update_id > first_id))
+        self.assertBookMatchesFeed(manager)
+
+    def test_gap_triggers_resync(self):
+        manager = self.manager()
+        manager.subscribe(self.symbol)
+        self.assertTrue(wait_for(lambda: manager.get_book(self.symbol) is not None))
+
+        with self.assertLogs("trading_analysis", level="WARNING") as logs:
+            self.feed.gap(self.symbol)
+            self.assertTrue(wait_for(lambda: any("restarting" in line for line in logs.output)))
+        self.assertIn("expected update", logs.output[0])
+        self.assertTrue(wait_for(lambda: manager.get_book(self.symbol) is not None))
+        self.assertBookMatchesFeed(manager)
+
+    def test_idle_streams_are_evicted(self):
+        manager = self.manager(max_symbols=1, idle_timeout=0.3)
+        self.assertTrue(manager.subscribe(self.symbol))
+        self.assertFalse(manager.subscribe("ETHUSDT"))
+
+        time.sleep(0.4)
+        self.assertTrue(manager.subscribe("ETHUSDT"))
+        self.assertNotIn(self.symbol, manager.books)
+        self.assertTrue(wait_for(lambda: manager.get_book("ETHUSDT") is not None))
+
+class StandInMixin:
+    def standin(self, **options) -> str:
+        server = start_standin_server(**options)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+class AsyncBinanceClientTests(StandInMixin, SimpleTestCase):
+    def test_client_of_previous_loop_is_closed_on_that_loop(self):
+        binance_client = AsyncBinanceClient(base_url=self.standin())
+
+        async def current_client():
+            return binance_client.client
+
+        run_sync(binance_client.get_order_book("BTCUSDT", 5, fresh=True))
+        previous = run_sync(current_client())
+        replacement = asyncio.run(current_client())
+
+        self.assertIsNot(previous, replacement)
+        self.assertTrue(wait_for(lambda: previous.is_closed))
+
+    def test_tick_sizes_are_cached_per_client(self):
+        url = self.standin()
+        first, second = AsyncBinanceClient(base_url=url), AsyncBinanceClient(base_url=url)
+
+        self.assertGreater(run_sync(first.get_tick_size("BTCUSDT")), 0)
+        self.assertIn("BTCUSDT", first._tick_sizes)
+        self.assertEqual(second._tick_sizes, {})
+
+class HedgedRequestTests(StandInMixin, SimpleTestCase):
+
+    def test_server_error_fails_over_to_healthy_host(self):
+        failing, healthy = self.standin(fail_status=503), self.standin()
+        client = AsyncBinanceClient(base_urls=[failing, healthy])
+
+        order_book = run_sync(client.get_order_book("BTCUSDT", 5, fresh=True))
+        self.assertEqual(len(order_book["bids"]), 5)
+        self.assertEqual(client.router.stats()[failing]["ewma_ms"], client.router.failure_latency * 1000)
+        self.assertEqual(client.router.ranked(), [healthy, failing])
+
+    def test_slow_host_is_hedged(self):
+        slow, fast = self.standin(latency=1.0), self.standin()
+        client = AsyncBinanceClient(base_urls=[slow, fast])
+        client.router = HedgedRouter([slow, fast], max_delay=0.1)
+
+        started = time.monotonic()
+        run_sync(client.get_order_book("BTCUSDT", 5, fresh=True))
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertEqual(client.router.ranked()[0], fast)
+
+class IncrementalVolumeProfileTests(SimpleTestCase):
+    def assertMatchesOverlapHistogram(self, profile: IncrementalVolumeProfile, window: OhlcvFrame):
+        edges = aligned_bin_edges(float(window.low.min()), float(window.high.max()), profile.bin_size, 0.01)
+        expected = overlap_histogram(window, edges)
+        actual = profile.to_dict()
+
+        offset = int(round(actual["price_levels"][0] / profile.bin_size - 0.5 - edges[0] / profile.bin_size))
+        volumes = np.zeros(len(expected))
+        volumes[offset:offset + len(actual["volumes"])] = actual["volumes"]
+        np.testing.assert_allclose(volumes, expected, atol=1e-6)
+        self.assertAlmostEqual(actual["poc"], float(edges[np.argmax(expected)] + profile.bin_size / 2))
+
+    def test_rolling_window_matches_overlap_histogram(self):
+        frame, window = random_frame(seed=3, length=400), 120
+        profile = IncrementalVolumeProfile(0.05, tick_size=0.01)
+        for index in range(window):
+            profile.add(frame.candle(index))
+        self.assertMatchesOverlapHistogram(profile, frame[:window])
+
+        for index in range(window, len(frame)):
+            profile.add(frame.candle(index))
+            profile.evict(frame.candle(index - window))
+            if index % 20 == 0 or index == len(frame) - 1:
+                self.assertMatchesOverlapHistogram(profile, frame[index - window + 1:index + 1])
+
+class StreamingPivotDetectorTests(SimpleTestCase):
+    def test_matches_batch_pivot_masks(self):
+        frame = random_frame(seed=11, length=500)
+        frame.high[100:110] = frame.high[100]
+        for window in (1, 2, 3, 5, 8):
+            for strict in (False, True):
+                with self.subTest(window=window, strict=strict):
+                    events = StreamingPivotDetector(window, strict=strict).update_many(frame)
+                    masks = pivot_masks(frame.high, frame.low, window, strict)
+                    highs = [event["index"] for event in events if event["type"] == "high"]
+                    lows = [event["index"] for event in events if event["type"] == "low"]
+                    self.assertEqual(highs, np.flatnonzero(masks.highs).tolist())
+                    self.assertEqual(lows, np.flatnonzero(masks.lows).tolist())
+
+    def test_exclusive_prefers_high_pivot(self):
+        detector = StreamingPivotDetector(1, exclusive=True)
+        events = [event for candle in [(1.0, 1.0), (2.0, 0.5), (1.0, 1.0)] for event in detector.update(candle)]
+        self.assertEqual(events, [{"index": 1, "price": 2.0, "type": "high"}])
+
+class CandleStoreTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = CandleStore(directory.name)
+        self.frame = OhlcvFrame.from_klines(synthetic_klines("BTCUSDT", "1h", 60, now=1_700_000_000_000))
+
+    def test_append_skips_stored_candles(self):
+        self.assertEqual(self.store.append("BTCUSDT", "1h", self.frame[:30]), 30)
+        self.assertEqual(self.store.append("BTCUSDT", "1h", self.frame[:20]), 0)
+        self.assertEqual(self.store.append("BTCUSDT", "1h", self.frame[20:45]), 15)
+        assertFramesEqual(self, self.store.read("BTCUSDT", "1h"), self.frame[:45])
+
+    def test_prepend_keeps_only_older_candles(self):
+        self.store.append("BTCUSDT", "1h", self.frame[30:])
+        self.assertEqual(self.store.prepend("BTCUSDT", "1h", self.frame[40:]), 0)
+        self.assertEqual(self.store.prepend("BTCUSDT", "1h", self.frame[10:35]), 20)
+        self.assertEqual(self.store.prepend("BTCUSDT", "1h", self.frame[:10]), 10)
+        assertFramesEqual(self, self.store.read("BTCUSDT", "1h"), self.frame)
+
+    def test_reset_clears_series_and_history_start(self):
+        self.store.append("BTCUSDT", "1h", self.frame)
+        self.store.mark_history_start("BTCUSDT", "1h")
+        self.assertTrue(self.store.at_history_start("BTCUSDT", "1h"))
+
+        self.store.reset("BTCUSDT", "1h")
+        self.assertFalse(self.store.read("BTCUSDT", "1h"))
+        self.assertFalse(self.store.at_history_start("BTCUSDT", "1h"))
+
+    def test_invalid_series_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.store.read("../BTCUSDT", "1h")
+
+@override_settings(CANDLE_STORE_ENABLED=True, RESAMPLE_BASE_INTERVAL=None)
+class CandleCatchUpTests(SimpleTestCase):
+    symbol, interval = "BTCUSDT", "4h"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = CandleStore(directory.name)
+        patcher = mock.patch.object(async_client, "candle_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.interval_ms = interval_to_ms(self.interval)
+        self.listed_at = None
+        self.calls = []
+        self.binance_client = AsyncBinanceClient(base_url="http://127.0.0.1:9")
+        self.binance_client.get_klines = self.get_klines
+
+    async def get_klines(self, symbol, interval, limit=100, start_time=None, end_time=None):
+        self.calls.append((limit, start_time, end_time))
+        klines = synthetic_klines(symbol, interval, limit, start_time, end_time)
+        return [kline for kline in klines if self.listed_at is None or kline[0] >= self.listed_at]
+
+    def latest(self, limit: int) -> OhlcvFrame:
+        return OhlcvFrame.from_klines(synthetic_klines(self.symbol, self.interval, limit))
+
+    def get_candles(self, limit: int) -> OhlcvFrame:
+        self.calls.clear()
+        return run_sync(self.binance_client.get_candles(self.symbol, self.interval, limit))
+
+    def test_cold_store_fetches_latest_and_stores_closed_candles(self):
+        assertFramesEqual(self, self.get_candles(100), self.latest(100))
+        self.assertEqual(self.calls, [(100, None, None)])
+        assertFramesEqual(self, self.store.read(self.symbol, self.interval), self.latest(100)[:-1])
+
+    def test_short_downtime_fetches_only_the_tail(self):
+        self.store.append(self.symbol, self.interval, self.latest(200)[:-30])
+        stored_last = int(self.store.read(self.symbol, self.interval).timestamp[-1])
+
+        assertFramesEqual(self, self.get_candles(100), self.latest(100))
+        self.assertEqual(self.calls, [(30, stored_last + self.interval_ms, None)])
+
+    def test_long_downtime_is_fetched_in_pages(self):
+        self.store.append(self.symbol, self.interval, self.latest(2000)[:-1500])
+
+        assertFramesEqual(self, self.get_candles(100), self.latest(100))
+        self.assertEqual(len(self.calls), 2)
+        stored = self.store.read(self.symbol, self.interval)
+        self.assertTrue(np.all(np.diff(stored.timestamp) == self.interval_ms))
+
+    def test_shortfall_is_backfilled_in_front(self):
+        self.store.append(self.symbol, self.interval, self.latest(50)[:-1])
+
+        assertFramesEqual(self, self.get_candles(120), self.latest(120))
+        assertFramesEqual(self, self.store.read(self.symbol, self.interval), self.latest(120)[:-1])
+
+    def test_new_listing_backfills_once(self):
+        now = now_ms()
+        self.listed_at = now - now % self.interval_ms - 29 * self.interval_ms
+
+        assertFramesEqual(self, self.get_candles(100), self.latest(30))
+        self.assertTrue(self.store.at_history_start(self.symbol, self.interval))
+
+        assertFramesEqual(self, self.get_candles(100), self.latest(30))
+        self.assertEqual(self.calls, [(1, self.listed_at + 29 * self.interval_ms, None)])
+
+class ResponseCacheTests(StandInMixin, SimpleTestCase):
+    now = 1_700_000_000_000
+
+    def klines(self, limit: int, **options) -> np.ndarray:
+        return np.array(synthetic_klines("BTCUSDT", "1h", limit, now=self.now, **options), dtype=np.float64)
+
+    def ttl(self, policy: ResponseCachePolicy, params, payload, now=None):
+        return policy.ttl("/api/v3/klines", params, payload, now or self.now)
+
+    def test_forming_kline_ttl_ends_at_candle_close(self):
+        policy = ResponseCachePolicy(forming_kline_ttl=5.0)
+        payload = self.klines(3)
+        close_time = int(payload[-1][6])
+
+        self.assertEqual(self.ttl(policy, {"limit": 3}, payload), 5.0)
+        self.assertEqual(self.ttl(policy, {"limit": 3}, payload, now=close_time - 1999), 2.0)
+
+    def test_closed_klines_follow_the_candle_store_setting(self):
+        closed = self.klines(3, end_time=self.now - 3 * 3_600_000)
+        params = {"limit": 3, "endTime": int(closed[-1][6])}
+        self.assertIsNone(self.ttl(ResponseCachePolicy(), params, closed))
+        self.assertEqual(self.ttl(ResponseCachePolicy(cache_closed_klines=False), params, closed), 0.0)
+
+        self.assertIsNone(self.ttl(ResponseCachePolicy(), {"limit": 3}, closed))
+        self.assertEqual(self.ttl(ResponseCachePolicy(), {"limit": 5}, closed), 0.0)
+
+    def test_byte_bound_evicts_least_recently_used(self):
+        backend = LRUCacheBackend(max_entries=10, max_bytes=100)
+        backend.set("a", "first", None, size=40)
+        backend.set("b", "second", None, size=40)
+        backend.get("a")
+        backend.set("c", "third", None, size=40)
+
+        self.assertEqual(backend.get("b"), MISSING)
+        self.assertEqual((backend.get("a"), backend.get("c"), backend.size), ("first", "third", 80))
+
+        backend.set("d", "too large", None, size=101)
+        self.assertEqual(backend.get("d"), MISSING)
+        backend.set("a", np.zeros(5), None)
+        self.assertEqual(backend.size, 80)
+
+    def test_klines_are_sized_by_decoded_array(self):
+        cache = ResponseCache(LRUCacheBackend(), ResponseCachePolicy())
+        binance_client = AsyncBinanceClient(base_url=self.standin())
+        with mock.patch.object(async_client, "response_cache", cache):
+            klines = run_sync(binance_client.get_klines("BTCUSDT", "1h", 10))
+        self.assertEqual(cache.backend.size, klines.nbytes)
+
+class OrderBookAnalyticsTests(SimpleTestCase):
+    def test_walls_are_relative_to_local_median(self):
+        for price, tick in ((30_000.0, 0.01), (0.00001234, 1e-10)):
+            with self.subTest(price=price):
+                prices = price - np.arange(40) * tick
+                quantities = np.full(40, 3.0 / price)
+                quantities[[7, 30]] *= (4.5, 6.0)
+                self.assertEqual(detect_walls(prices, quantities, window=9, multiple=5.0).tolist(), [30])
+                self.assertEqual(detect_walls(prices, quantities, window=9, multiple=4.0).tolist(), [7, 30])
+        self.assertEqual(detect_walls(np.array([1.0, 2.0]), np.array([1.0, 100.0])).tolist(), [])
+
+    def test_imbalance_counts_levels_within_each_distance(self):
+        depth = depth_arrays({"bids": [[99.9, 1.0], [99.0, 10.0]], "asks": [[100.1, 1.0], [101.0, 1.0]]})
+        near = (99.9 - 100.1) / (99.9 + 100.1)
+        far = (99.9 + 990.0 - 100.1 - 101.0) / (99.9 + 990.0 + 100.1 + 101.0)
+        self.assertEqual(imbalance(depth, (10, 100)), {10: round(near, 4), 100: round(far, 4)})
+        self.assertEqual(imbalance(depth_arrays({"bids": [[1.0, 1.0]], "asks": []})), {})
+
+    def test_bucket_depth_is_tick_aligned_for_sub_cent_symbols(self):
+        for mid, tick in ((0.00001234, 1e-8), (0.0042, 1e-6), (30_000.0, 0.01)):
+            with self.subTest(mid=mid):
+                depth = depth_arrays(depth_book(mid, tick))
+                bucket_size, bid_prices, bid_quantities, ask_prices, ask_quantities = bucket_depth(depth, mid, tick, 50)
+
+                self.assertGreater(bucket_size, 0)
+                self.assertAlmostEqual(bucket_size / tick, round(bucket_size / tick), places=6)
+                self.assertLessEqual(len(bid_prices), 50)
+                self.assertTrue(np.all(np.diff(bid_prices) < 0) and np.all(np.diff(ask_prices) > 0))
+                self.assertLessEqual(bid_prices[0], depth.bid_prices[0] + tick / 2)
+                self.assertGreaterEqual(ask_prices[0], depth.ask_prices[0] - tick / 2)
+                self.assertAlmostEqual(bid_quantities.sum(), depth.bid_quantities.sum())
+                self.assertAlmostEqual(ask_quantities.sum(), depth.ask_quantities.sum())
+
+    def test_summary_drops_depth_shape(self):
+        liquidity = analyze_depth(depth_book(0.00001234, 1e-8), tick_size=1e-8)
+        self.assertTrue(set(DEPTH_SHAPE_KEYS) <= set(liquidity))
+        self.assertFalse(set(DEPTH_SHAPE_KEYS) & set(liquidity_summary(liquidity)))
+        self.assertEqual(liquidity_summary(liquidity)["mid_price"], liquidity["mid_price"])
+
+class DepthCodecTests(SimpleTestCase):
+    def test_round_trip_through_json(self):
+        for mid, tick in ((0.00001234, 1e-8), (30_000.0, 0.01)):
+            with self.subTest(mid=mid):
+                book = {"lastUpdateId": 42, **depth_book(mid, tick)}
+                encoded = json.loads(json.dumps(encode_depth(book, tick_size=tick)))
+                bucket_size, bid_prices, bid_quantities, ask_prices, ask_quantities = bucket_depth(depth_arrays(book), mid, tick)
+                decoded = decode_depth(encoded)
+
+                self.assertEqual(encoded["v"], DEPTH_CODEC_VERSION)
+                self.assertEqual((decoded["lastUpdateId"], decoded["bucket_size"]), (42, bucket_size))
+                np.testing.assert_allclose(decoded["bids"], np.column_stack((bid_prices, bid_quantities)))
+                np.testing.assert_allclose(decoded["asks"], np.column_stack((ask_prices, ask_quantities)))
+
+    def test_version_tag_is_checked(self):
+        encoded = encode_depth(depth_book(100.0, 0.01), tick_size=0.01)
+        with self.assertRaises(ValueError):
+            decode_depth({**encoded, "v": DEPTH_CODEC_VERSION + 1})
+        self.assertEqual(decode_depth({}), {})
+        self.assertEqual(encode_depth({}), {})
+
+    def test_prompt_depth_keeps_nearest_buckets(self):
+        encoded = encode_depth(depth_book(100.0, 0.01), tick_size=0.01)
+        decoded, summary = decode_depth(encoded), prompt_depth(encoded, levels=3)
+
+        self.assertEqual(summary["mid"], encoded["mid"])
+        self.assertEqual([price for price, _ in summary["bids"]], [price for price, _ in decoded["bids"][:3]])
+        self.assertEqual([price for price, _ in summary["asks"]], [price for price, _ in decoded["asks"][:3]])
+        self.assertEqual(prompt_depth({}), {})
+
+class KlineDecoderTests(SimpleTestCase):
+    def decode(self, body: bytes, chunk_size: int) -> np.ndarray:
+        async def chunks():
+            for start in range(0, len(body), chunk_size):
+                yield body[start:start + chunk_size]
+        return asyncio.run(decode_kline_stream(chunks()))
+
+    def expected(self, body: bytes) -> np.ndarray:
+        rows = json.loads(body)
+        return np.array([row[:KLINE_FIELDS] for row in rows], dtype=np.float64).reshape(-1, KLINE_FIELDS)
+
+    def test_matches_json_for_any_chunking(self):
+        body = json.dumps(synthetic_klines("ETHBTC", "1h", 300, now=1_700_000_000_000)).encode()
+        for chunk_size in (1, 7, 64, 4096, len(body)):
+            with self.subTest(chunk_size=chunk_size):
+                np.testing.assert_array_equal(self.decode(body, chunk_size), self.expected(body))
+
+    def test_empty_payload(self):
+        for body in (b"[]", b" [ ] \n"):
+            self.assertEqual(self.decode(body, 1).shape, (0, KLINE_FIELDS))
+
+    def test_truncated_payload_is_rejected(self):
+        body = json.dumps(synthetic_klines("BTCUSDT", "1h", 3, now=1_700_000_000_000)).encode()
+        for cut in (b"", body[:1], body[:-1], body[:len(body) // 2], body[:body.index(b"],") + 1]):
+            with self.subTest(cut=cut[-20:]):
+                with self.assertRaises(ValueError):
+                    json.loads(cut)
+                with self.assertRaises(ValueError):
+                    self.decode(cut, 16)
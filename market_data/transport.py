@@ -0,0 +1,203 @@
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger('trading_analysis')
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+TRANSPORT_MODES = (MODE_LIVE, MODE_RECORD, MODE_REPLAY)
+
+# Time-window and size parameters shift between runs; replay falls back to a fixture that ignores them.
+LOOSE_PARAMS = {"startTime", "endTime", "limit"}
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "date"}
+
+def _request_signature(request: httpx.Request, loose: bool = False) -> Dict:
+    params = sorted(
+        (name, value) for name, value in request.url.params.multi_items()
+        if not (loose and name in LOOSE_PARAMS)
+    )
+    return {
+        "method": request.method,
+        "path": request.url.path,
+        "params": params,
+        "body_sha1": None if loose or not request.content else hashlib.sha1(request.content).hexdigest()
+    }
+
+def fixture_key(request: httpx.Request, loose: bool = False) -> str:
+    signature = json.dumps(_request_signature(request, loose), sort_keys=True)
+    return hashlib.sha1(signature.encode()).hexdigest()
+
+class FixtureStore:
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._loose: Optional[Dict[str, Path]] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _loose_index(self) -> Dict[str, Path]:
+        with self._lock:
+            if self._loose is None:
+                self._loose = {}
+                for path in sorted(self.root.glob("*.json"), key=lambda p: p.stat().st_mtime):
+                    with open(path) as f:
+                        self._loose[json.load(f)["loose_key"]] = path
+            return self._loose
+
+    def save(self, request: httpx.Request, response: httpx.Response):
+        body = response.content
+        try:
+            encoded = {"body": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            encoded = {"body_b64": base64.b64encode(body).decode("ascii")}
+
+        fixture = {
+            "request": _request_signature(request),
+            "loose_key": fixture_key(request, loose=True),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            **encoded
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(fixture_key(request))
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=1)
+        tmp.replace(path)
+        with self._lock:
+            if self._loose is not None:
+                self._loose[fixture["loose_key"]] = path
+
+    def load(self, request: httpx.Request) -> Optional[httpx.Response]:
+        path = self._path(fixture_key(request))
+        if not path.exists():
+            path = self._loose_index().get(fixture_key(request, loose=True))
+            if path is None:
+                return None
+        with open(path) as f:
+            fixture = json.load(f)
+
+        body = fixture["body"].encode("utf-8") if "body" in fixture else base64.b64decode(fixture["body_b64"])
+        return httpx.Response(fixture["status"], headers=fixture["headers"], content=body, request=request)
+
+class FaultInjector:
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self, request: httpx.Request) -> Tuple[float, Optional[Exception]]:
+        with self._lock:
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        error = httpx.ConnectError(f"Injected transport error: {request.method} {request.url.path}", request=request)
+        return self.latency, error if failed else None
+
+    def apply(self, request: httpx.Request):
+        delay, error = self._draw(request)
+        if delay:
+            time.sleep(delay)
+        if error:
+            raise error
+
+    async def apply_async(self, request: httpx.Request):
+        delay, error = self._draw(request)
+        if delay:
+            await asyncio.sleep(delay)
+        if error:
+            raise error
+
+class LiveTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, store: Optional[FixtureStore] = None, faults: Optional[FaultInjector] = None, **options):
+        self.store = store
+        self.faults = faults or FaultInjector()
+        self.options = options
+        self._sync = None
+        self._async = None
+
+    def _recorded(self, request: httpx.Request, response: httpx.Response) -> httpx.Response:
+        self.store.save(request, response)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+        return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.faults.apply(request)
+        if self._sync is None:
+            self._sync = httpx.HTTPTransport(**self.options)
+        response = self._sync.handle_request(request)
+        if self.store is None:
+            return response
+        try:
+            response.read()
+        finally:
+            response.close()
+        return self._recorded(request, response)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.faults.apply_async(request)
+        if self._async is None:
+            self._async = httpx.AsyncHTTPTransport(**self.options)
+        response = await self._async.handle_async_request(request)
+        if self.store is None:
+            return response
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return self._recorded(request, response)
+
+    def close(self):
+        if self._sync is not None:
+            self._sync.close()
+
+    async def aclose(self):
+        if self._async is not None:
+            await self._async.aclose()
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, store: FixtureStore, faults: Optional[FaultInjector] = None):
+        self.store = store
+        self.faults = faults or FaultInjector()
+
+    def _replay(self, request: httpx.Request) -> httpx.Response:
+        response = self.store.load(request)
+        if response is None:
+            raise httpx.ConnectError(f"No recorded fixture for {request.method} {request.url}", request=request)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.faults.apply(request)
+        return self._replay(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.faults.apply_async(request)
+        return self._replay(request)
+
+_stores: Dict[Path, FixtureStore] = {}
+
+def build_transport(service: str, **options) -> Optional[Union[LiveTransport, ReplayTransport]]:
+    mode = settings.MARKET_DATA_TRANSPORT
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"Unsupported transport mode: {mode}")
+
+    faults = FaultInjector(settings.TRANSPORT_LATENCY, settings.TRANSPORT_ERROR_RATE, settings.TRANSPORT_SEED)
+    if mode == MODE_LIVE and not faults.latency and not faults.error_rate:
+        return None
+
+    root = Path(settings.TRANSPORT_FIXTURE_DIR) / service
+    store = _stores.setdefault(root, FixtureStore(root))
+    if mode == MODE_REPLAY:
+        return ReplayTransport(store, faults)
+    return LiveTransport(store if mode == MODE_RECORD else None, faults, **options)
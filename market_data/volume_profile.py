@@ -0,0 +1,104 @@
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple, Union
+import math
+import numpy as np
+from .frame import OhlcvFrame
+
+DEFAULT_BINS = 50
+DEFAULT_SAMPLES_PER_CANDLE = 10
+VALUE_AREA_RATIO = 0.68
+
+MODE_SAMPLED = "sampled"
+MODE_OVERLAP = "overlap"
+PROFILE_MODES = (MODE_SAMPLED, MODE_OVERLAP)
+
+def tick_precision(tick_size: float) -> int:
+    return max(0, -Decimal(str(tick_size)).normalize().as_tuple().exponent)
+
+def aligned_bin_size(price_range: float, tick_size: float, bins: int = DEFAULT_BINS) -> float:
+    raw_ticks = max(price_range / tick_size / bins, 1.0)
+    magnitude = 10 ** math.floor(math.log10(raw_ticks))
+    for step in (1, 2, 5, 10):
+        if step * magnitude >= raw_ticks:
+            break
+    return round(step * magnitude * tick_size, tick_precision(tick_size))
+
+def aligned_bin_edges(low: float, high: float, bin_size: float, tick_size: float) -> np.ndarray:
+    first = math.floor(round(low / bin_size, 9))
+    last = max(math.ceil(round(high / bin_size, 9)), first + 1)
+    return np.round(np.arange(first, last + 1) * bin_size, tick_precision(tick_size))
+
+def sample_candle_volume(frame: OhlcvFrame, samples_per_candle: int = DEFAULT_SAMPLES_PER_CANDLE) -> Tuple[np.ndarray, np.ndarray]:
+    prices = np.linspace(frame.low, frame.high, samples_per_candle, axis=1).ravel()
+    weights = np.repeat(frame.volume / samples_per_candle, samples_per_candle)
+    return prices, weights
+
+def overlap_histogram(frame: OhlcvFrame, edges: np.ndarray) -> np.ndarray:
+    low, high, volume = frame.low, frame.high, frame.volume
+    span = high - low
+    ranged = span > 0
+
+    density = volume[ranged] / span[ranged]
+    cumulative = _cumulative_ramp(low[ranged], density, edges) - _cumulative_ramp(high[ranged], density, edges)
+    volumes = np.diff(cumulative)
+
+    point_bins = np.clip(np.searchsorted(edges, low[~ranged], side="right") - 1, 0, len(edges) - 2)
+    volumes += np.bincount(point_bins, weights=volume[~ranged], minlength=len(edges) - 1)
+    return np.maximum(volumes, 0.0)
+
+def _cumulative_ramp(starts: np.ndarray, density: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    order = np.argsort(starts, kind="stable")
+    cumulative_density = np.concatenate(([0.0], np.cumsum(density[order])))
+    cumulative_moment = np.concatenate(([0.0], np.cumsum(density[order] * starts[order])))
+    started = np.searchsorted(starts[order], edges, side="left")
+    return edges * cumulative_density[started] - cumulative_moment[started]
+
+def value_area(price_levels: np.ndarray, volumes: np.ndarray, ratio: float = VALUE_AREA_RATIO) -> Tuple[float, float, float]:
+    if not len(volumes):
+        return 0.0, 0.0, 0.0
+
+    order = np.argsort(-volumes, kind="stable")
+    cumulative = np.cumsum(volumes[order])
+    cutoff = min(int(np.searchsorted(cumulative, cumulative[-1] * ratio)), len(order) - 1)
+    value_area_prices = price_levels[order[:cutoff + 1]]
+
+    return float(price_levels[order[0]]), float(value_area_prices.max()), float(value_area_prices.min())
+
+def compute_volume_profile(ohlcv_data: Union[OhlcvFrame, List[Dict]], bins: int = DEFAULT_BINS,
+                           samples_per_candle: int = DEFAULT_SAMPLES_PER_CANDLE,
+                           value_area_ratio: float = VALUE_AREA_RATIO, mode: str = MODE_SAMPLED,
+                           tick_size: Optional[float] = None, bin_size: Optional[float] = None) -> Dict:
+    frame = OhlcvFrame.coerce(ohlcv_data)
+    if not frame:
+        return {}
+
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown volume profile mode: {mode}")
+
+    low, high = float(frame.low.min()), float(frame.high.max())
+    if tick_size:
+        bin_size = bin_size or aligned_bin_size(high - low, tick_size, bins)
+        edges = aligned_bin_edges(low, high, bin_size, tick_size)
+    else:
+        edges = np.histogram_bin_edges([low, high], bins=bins)
+        bin_size = float(edges[1] - edges[0])
+
+    if mode == MODE_OVERLAP:
+        volumes = overlap_histogram(frame, edges)
+    else:
+        prices, weights = sample_candle_volume(frame, samples_per_candle)
+        volumes, _ = np.histogram(prices, bins=edges, weights=weights)
+
+    price_levels = (edges[:-1] + edges[1:]) / 2
+    if tick_size:
+        price_levels = np.round(price_levels, tick_precision(tick_size) + 1)
+    poc, vah, val = value_area(price_levels, volumes, value_area_ratio)
+
+    return {
+        "poc": poc,
+        "vah": vah,
+        "val": val,
+        "bin_size": bin_size,
+        "price_levels": price_levels,
+        "volumes": volumes
+    }
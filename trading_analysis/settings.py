@@ -117,11 +117,55 @@ if not CLAUDE_API_KEY:
     # В продакшене можно заменить на raise Exception
     
 CLAUDE_MODEL = settings.CLAUDE_MODEL
+CLAUDE_BASE_URL = settings.get('CLAUDE_BASE_URL', None)
 BINANCE_BASE_URL = settings.BINANCE_BASE_URL
+BINANCE_BASE_URLS = settings.get('BINANCE_BASE_URLS', [BINANCE_BASE_URL])
+BINANCE_HEDGING_ENABLED = settings.get('BINANCE_HEDGING_ENABLED', False)
+BINANCE_HEDGE_PERCENTILE = settings.get('BINANCE_HEDGE_PERCENTILE', 95)
+BINANCE_HEDGE_MIN_DELAY = settings.get('BINANCE_HEDGE_MIN_DELAY', 0.05)
+BINANCE_HEDGE_MAX_DELAY = settings.get('BINANCE_HEDGE_MAX_DELAY', 1.0)
+BINANCE_WS_URL = settings.get('BINANCE_WS_URL', 'wss://stream.binance.com:9443')
 BINANCE_RATE_LIMIT = settings.BINANCE_RATE_LIMIT
+BINANCE_RATE_LIMIT_BACKEND = settings.get('BINANCE_RATE_LIMIT_BACKEND', 'file')
+BINANCE_RATE_LIMIT_FILE = settings.get('BINANCE_RATE_LIMIT_FILE', BASE_DIR / 'run' / 'binance_weight.bin')
 DEFAULT_KLINES_LIMIT = settings.DEFAULT_KLINES_LIMIT
+MAX_KLINES_HISTORY = settings.get('MAX_KLINES_HISTORY', 50000)
+BINANCE_MAX_CONCURRENCY = settings.get('BINANCE_MAX_CONCURRENCY', 5)
+BINANCE_MAX_CONNECTIONS = settings.get('BINANCE_MAX_CONNECTIONS', 20)
+BINANCE_HTTP2 = settings.get('BINANCE_HTTP2', True)
+BINANCE_TIMEOUT = settings.get('BINANCE_TIMEOUT', 5.0)
+BINANCE_CONNECT_TIMEOUT = settings.get('BINANCE_CONNECT_TIMEOUT', 2.0)
+BINANCE_MAX_RETRIES = settings.get('BINANCE_MAX_RETRIES', 2)
+BINANCE_RETRY_BASE_DELAY = settings.get('BINANCE_RETRY_BASE_DELAY', 0.2)
+BINANCE_RETRY_MAX_DELAY = settings.get('BINANCE_RETRY_MAX_DELAY', 5.0)
+BINANCE_CIRCUIT_FAILURE_THRESHOLD = settings.get('BINANCE_CIRCUIT_FAILURE_THRESHOLD', 5)
+BINANCE_CIRCUIT_RESET_TIMEOUT = settings.get('BINANCE_CIRCUIT_RESET_TIMEOUT', 30)
+ORDER_BOOK_STREAM_ENABLED = settings.get('ORDER_BOOK_STREAM_ENABLED', True)
+ORDER_BOOK_STREAM_MAX_SYMBOLS = settings.get('ORDER_BOOK_STREAM_MAX_SYMBOLS', 20)
+ORDER_BOOK_STREAM_MAX_AGE = settings.get('ORDER_BOOK_STREAM_MAX_AGE', 5)
+ORDER_BOOK_STREAM_IDLE_TIMEOUT = settings.get('ORDER_BOOK_STREAM_IDLE_TIMEOUT', 300)
+MARKET_DATA_CACHE_BACKEND = settings.get('MARKET_DATA_CACHE_BACKEND', 'memory')
+MARKET_DATA_CACHE_ALIAS = settings.get('MARKET_DATA_CACHE_ALIAS', 'default')
+MARKET_DATA_CACHE_MAX_ENTRIES = settings.get('MARKET_DATA_CACHE_MAX_ENTRIES', 2048)
+MARKET_DATA_CACHE_MAX_BYTES = settings.get('MARKET_DATA_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+MARKET_DATA_CACHE_FORMING_KLINE_TTL = settings.get('MARKET_DATA_CACHE_FORMING_KLINE_TTL', 5)
+MARKET_DATA_CACHE_TICKER_TTL = settings.get('MARKET_DATA_CACHE_TICKER_TTL', 2)
+MARKET_DATA_CACHE_DEPTH_TTL = settings.get('MARKET_DATA_CACHE_DEPTH_TTL', 1)
+MARKET_DATA_CACHE_EXCHANGE_INFO_TTL = settings.get('MARKET_DATA_CACHE_EXCHANGE_INFO_TTL', 21600)
 SUPPORTED_TIMEFRAMES = settings.SUPPORTED_TIMEFRAMES
 SUPPORTED_METHODS = settings.SUPPORTED_METHODS
+SYMBOL_SYNC_INTERVAL = settings.get('SYMBOL_SYNC_INTERVAL', 3600)
+SYMBOL_SYNC_RETRY_DELAY = settings.get('SYMBOL_SYNC_RETRY_DELAY', 30)
+VOLUME_PROFILE_MODE = settings.get('VOLUME_PROFILE_MODE', 'sampled')
+CANDLE_STORE_ENABLED = settings.get('CANDLE_STORE_ENABLED', True)
+CANDLE_STORE_DIR = settings.get('CANDLE_STORE_DIR', BASE_DIR / 'candle_store')
+RESAMPLE_BASE_INTERVAL = settings.get('RESAMPLE_BASE_INTERVAL', '1h')
+RESAMPLE_MAX_BASE_CANDLES = settings.get('RESAMPLE_MAX_BASE_CANDLES', 5000)
+MARKET_DATA_TRANSPORT = settings.get('MARKET_DATA_TRANSPORT', 'live')
+TRANSPORT_FIXTURE_DIR = settings.get('TRANSPORT_FIXTURE_DIR', BASE_DIR / 'fixtures' / 'http')
+TRANSPORT_LATENCY = settings.get('TRANSPORT_LATENCY', 0.0)
+TRANSPORT_ERROR_RATE = settings.get('TRANSPORT_ERROR_RATE', 0.0)
+TRANSPORT_SEED = settings.get('TRANSPORT_SEED', None)
 
 LOGGING = {
     'version': 1,